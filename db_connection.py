@@ -3,22 +3,87 @@ db_connection.py - Database connection module for College Event Participation Tr
 """
 
 import mysql.connector
-from mysql.connector import Error
+from mysql.connector import Error, InterfaceError, OperationalError, HAVE_CEXT
+from mysql.connector.constants import ClientFlag
 import os
 from getpass import getpass
 import configparser
+import re
 import sys
+import threading
+import time
+import weakref
+from contextlib import contextmanager
+from migrations import MIGRATIONS
+
+# MySQL error codes meaning a migration has already been applied
+# (table already exists, duplicate column, duplicate key name, trigger already exists)
+ALREADY_APPLIED_ERRORS = {1050, 1060, 1061, 1359}
+
+# Seconds a connection may sit idle before it is pinged before reuse
+PING_AFTER_IDLE = 60
+
+# Characters with special meaning in BOOLEAN MODE full-text searches
+_FULLTEXT_OPERATORS = re.compile(r'[+\-<>()~*"@]')
+
+# Names of the migrations from migrations.py that have fully run
+_Q_CREATE_SCHEMA_MIGRATIONS = """
+CREATE TABLE IF NOT EXISTS schema_migrations (
+    name VARCHAR(64) NOT NULL PRIMARY KEY,
+    applied_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+)
+"""
 
 
 class DatabaseConnection:
-    """Class to handle database connections and basic operations"""
+    """Class to handle database connections and basic operations
+
+    The shared instance is safe to use from several threads: each thread
+    keeps its own autocommit connection, transaction() state is kept per
+    thread, and the prepared statement connection is locked.
+    """
+
+    # Shared instance returned by every construction
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    # Parsed configurations keyed by (config file, modification time)
+    _config_cache = {}
+
+    def __new__(cls, *args, **kwargs):
+        """Return the shared instance, creating it on first use"""
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = super().__new__(cls)
+        return cls._instance
 
     def __init__(self, config_file='config.ini'):
-        """Initialize the database connection"""
-        self.connection = None
-        self.cursor = None
-        self.config_file = config_file
-        self.connect()
+        """Initialize connection settings; the database is contacted on first query"""
+        with self._instance_lock:
+            if getattr(self, '_initialized', False):
+                return
+            # Serializes the first connect between threads
+            self._connect_lock = threading.Lock()
+            # Per-thread idle connection and transaction() state
+            self._local = threading.local()
+            # Every open thread connection, so close() can reach them all; weak
+            # references let a finished thread's connection be collected, and
+            # the driver closes it then
+            self._connections = weakref.WeakSet()
+            self._connections_lock = threading.Lock()
+            # Dedicated connection holding server-side prepared statements
+            self._prepared_connection = None
+            self._prepared = {}
+            self._prepared_last_used = 0.0
+            self._prepared_lock = threading.Lock()
+            # Dedicated connection allowed several statements per query, for fetch_all_multi
+            self._multi_connection = None
+            self._multi_last_used = 0.0
+            self._multi_lock = threading.Lock()
+            self.db_config = None
+            self.config_file = config_file
+            # Set last, so no thread skips setup before every attribute exists
+            self._initialized = True
 
     def create_config_if_not_exists(self):
         """Create a new configuration file if it doesn't exist"""
@@ -45,16 +110,50 @@ class DatabaseConnection:
                 sys.exit(1)
 
     def read_config(self):
-        """Read database configuration from file"""
-        config = configparser.ConfigParser()
-        config.read(self.config_file)
+        """Read database configuration from file (cached until the file changes)"""
+        key = (self.config_file, os.path.getmtime(self.config_file))
+        db_config = self._config_cache.get(key)
+        
+        if db_config is None:
+            config = configparser.ConfigParser()
+            config.read(self.config_file)
+            
+            db_config = {
+                'host': config['DATABASE']['Host'],
+                'user': config['DATABASE']['User'],
+                'password': config['DATABASE']['Password'],
+                'database': config['DATABASE']['Database'],
+                'allow_local_infile': False,
+                'use_pure': not HAVE_CEXT,
+                'compress': True,
+                # Connections are kept per thread, so each statement commits on
+                # its own rather than leaving a read snapshot open between queries
+                'autocommit': True,
+                'charset': 'utf8mb4'
+            }
+            if not HAVE_CEXT:
+                print("Warning: MySQL C extension not available, using the pure Python driver")
+            self._config_cache[key] = db_config
         
-        return {
-            'host': config['DATABASE']['Host'],
-            'user': config['DATABASE']['User'],
-            'password': config['DATABASE']['Password'],
-            'database': config['DATABASE']['Database']
-        }
+        # Return a copy so callers can modify it without touching the cache
+        return dict(db_config)
+
+    def open_connection(self):
+        """Open a new connection with the settings used by all query methods"""
+        # Report matched rather than changed rows so rowcount signals existence
+        connection = mysql.connector.connect(client_flags=[ClientFlag.FOUND_ROWS], **self.db_config)
+        with self._connections_lock:
+            self._connections.add(connection)
+        return connection
+
+    def close_connection(self, connection):
+        """Close a connection opened by open_connection, ignoring errors"""
+        with self._connections_lock:
+            self._connections.discard(connection)
+        try:
+            connection.close()
+        except Error:
+            pass
 
     def connect(self):
         """Connect to the MySQL database"""
@@ -63,16 +162,15 @@ class DatabaseConnection:
             self.create_config_if_not_exists()
             
             # Read configuration
-            db_config = self.read_config()
-            
-            # Connect to the database
-            self.connection = mysql.connector.connect(**db_config)
+            self.db_config = self.read_config()
             
-            if self.connection.is_connected():
-                self.cursor = self.connection.cursor(dictionary=True)
-                print(f"Connected to MySQL database: {db_config['database']}")
+            # Open this thread's connection, which also checks the database exists
+            self.release(self.get_connection(), None)
+            print(f"Connected to MySQL database: {self.db_config['database']}")
+            self.apply_migrations()
         except Error as e:
             print(f"Error connecting to MySQL database: {e}")
+            self.db_config = None
             
             # Handle database not existing
             if "Unknown database" in str(e):
@@ -82,36 +180,36 @@ class DatabaseConnection:
                     db_name = db_config['database']
                     del db_config['database']
                     
-                    self.connection = mysql.connector.connect(**db_config)
-                    self.cursor = self.connection.cursor()
+                    connection = mysql.connector.connect(
+                        client_flags=[ClientFlag.MULTI_STATEMENTS], **db_config
+                    )
+                    cursor = connection.cursor()
                     
                     # Create database and tables from schema file
                     print(f"Creating database '{db_name}'...")
-                    self.cursor.execute(f"CREATE DATABASE IF NOT EXISTS {db_name}")
-                    self.cursor.execute(f"USE {db_name}")
+                    cursor.execute(f"CREATE DATABASE IF NOT EXISTS {db_name}")
+                    cursor.execute(f"USE {db_name}")
                     
                     # Read and execute schema file
                     try:
                         with open('database_schema.sql', 'r') as schema_file:
                             schema_sql = schema_file.read()
                             
-                            # Split schema into individual statements
-                            statements = schema_sql.split(';')
-                            for statement in statements:
-                                if statement.strip():
-                                    self.cursor.execute(statement)
+                            # Send the whole schema in one multi-statement batch
+                            for _ in cursor.execute(schema_sql, multi=True):
+                                pass
                             
-                            self.connection.commit()
+                            connection.commit()
                             print("Database schema created successfully!")
                             
                             # Reconnect with the new database
-                            self.cursor.close()
-                            self.connection.close()
+                            cursor.close()
+                            connection.close()
                             
                             # Update config with the new database
                             db_config['database'] = db_name
-                            self.connection = mysql.connector.connect(**db_config)
-                            self.cursor = self.connection.cursor(dictionary=True)
+                            self.db_config = db_config
+                            self.apply_migrations()
                             
                     except FileNotFoundError:
                         print("Schema file not found. Manual database setup required.")
@@ -120,53 +218,453 @@ class DatabaseConnection:
                     print(f"Error creating database: {create_error}")
                     sys.exit(1)
 
+    def apply_migrations(self):
+        """Apply schema migrations not yet recorded in schema_migrations
+
+        Every statement of a pending migration is run, skipping those whose
+        object already exists; the migration is recorded only when none of
+        them failed otherwise, so a partial failure is retried next time.
+        """
+        connection = self.get_connection()
+        cursor = connection.cursor()
+        try:
+            cursor.execute(_Q_CREATE_SCHEMA_MIGRATIONS)
+            cursor.execute("SELECT name FROM schema_migrations")
+            applied = {name for (name,) in cursor.fetchall()}
+            
+            for name, statements in MIGRATIONS:
+                if name in applied:
+                    continue
+                
+                complete = True
+                for statement in statements:
+                    try:
+                        cursor.execute(statement)
+                    except Error as e:
+                        if e.errno not in ALREADY_APPLIED_ERRORS:
+                            print(f"Error applying migration {name}: {e}")
+                            complete = False
+                            break
+                
+                if complete:
+                    cursor.execute("INSERT INTO schema_migrations (name) VALUES (%s)", (name,))
+        finally:
+            self.release(connection, cursor)
+
+    def ensure_connected(self):
+        """Connect to the database if no thread has done so yet"""
+        if self.db_config is None:
+            with self._connect_lock:
+                if self.db_config is None:
+                    self.connect()
+
+    def get_connection(self):
+        """Borrow this thread's connection, connecting first if needed
+
+        A connection idle for more than PING_AFTER_IDLE seconds is pinged and
+        replaced if the server has dropped it; recently used ones are trusted.
+        While a connection is borrowed (e.g. by a half-read fetch_iter) other
+        queries on the thread get a connection of their own.
+        """
+        transaction_connection = getattr(self._local, 'connection', None)
+        if transaction_connection is not None:
+            return transaction_connection
+        
+        self.ensure_connected()
+        if self.db_config is None:
+            raise Error("Not connected to MySQL database")
+        
+        connection = getattr(self._local, 'idle', None)
+        self._local.idle = None
+        if (connection is not None
+                and time.monotonic() - self._local.last_used > PING_AFTER_IDLE
+                and not connection.is_connected()):
+            self.close_connection(connection)
+            connection = None
+        if connection is None:
+            connection = self.open_connection()
+        return connection
+
+    def release(self, connection, cursor):
+        """Close the cursor and keep the connection for the thread's next query"""
+        if cursor is not None:
+            cursor.close()
+        if connection is None or connection is getattr(self._local, 'connection', None):
+            return
+        
+        # Keep one connection per thread, dropping any the server has broken
+        if connection is getattr(self._local, 'broken', None) or getattr(self._local, 'idle', None) is not None:
+            self._local.broken = None
+            self.close_connection(connection)
+        else:
+            self._local.idle = connection
+            self._local.last_used = time.monotonic()
+
+    def check_error(self, connection, error):
+        """Count a failed query and stop reusing connection, if given, when
+        error means it is no longer usable"""
+        self._local.errors = self.error_count() + 1
+        if connection is not None and isinstance(error, (InterfaceError, OperationalError)):
+            self._local.broken = connection
+
+    def error_count(self):
+        """Return how many queries have failed on this thread so far
+
+        Query methods return empty results on error; comparing counts tells
+        an empty result from a failed one.
+        """
+        return getattr(self._local, 'errors', 0)
+
+    def mark_failed(self):
+        """Make the open transaction, if any, roll back instead of committing"""
+        self._local.failed = True
+
+    @contextmanager
+    def transaction(self):
+        """Run the enclosed queries on one connection and commit them once
+
+        Queries executed by this thread inside the block share its transaction.
+        The transaction is rolled back if the block raises or any query fails.
+        """
+        if getattr(self._local, 'connection', None) is not None:
+            # Nested use joins the outer transaction
+            yield
+            return
+        
+        connection = self.get_connection()
+        connection.start_transaction()
+        self._local.connection = connection
+        self._local.failed = False
+        try:
+            yield
+            if self._local.failed:
+                connection.rollback()
+            else:
+                connection.commit()
+        except BaseException:
+            connection.rollback()
+            raise
+        finally:
+            self._local.connection = None
+            self.release(connection, None)
+
     def execute_query(self, query, params=None):
         """Execute a query and commit changes"""
+        connection = cursor = None
         try:
-            if not self.connection or not self.connection.is_connected():
-                self.connect()
-                
-            self.cursor.execute(query, params or ())
-            self.connection.commit()
+            connection = self.get_connection()
+            cursor = connection.cursor(dictionary=True)
+            cursor.execute(query, params or ())
             return True
         except Error as e:
             print(f"Error executing query: {e}")
+            self.check_error(connection, e)
+            self.mark_failed()
             return False
+        finally:
+            self.release(connection, cursor)
+
+    def execute_update(self, query, params=None):
+        """Execute a query, commit changes and return the affected row count (-1 on error)"""
+        connection = cursor = None
+        try:
+            connection = self.get_connection()
+            cursor = connection.cursor()
+            cursor.execute(query, params or ())
+            return cursor.rowcount
+        except Error as e:
+            print(f"Error executing query: {e}")
+            self.check_error(connection, e)
+            self.mark_failed()
+            return -1
+        finally:
+            self.release(connection, cursor)
+
+    def execute_many(self, query, seq_of_params):
+        """Execute a query once per parameter set and commit once"""
+        connection = cursor = None
+        try:
+            connection = self.get_connection()
+            cursor = connection.cursor()
+            cursor.executemany(query, seq_of_params)
+            return True
+        except Error as e:
+            print(f"Error executing query: {e}")
+            self.check_error(connection, e)
+            self.mark_failed()
+            return False
+        finally:
+            self.release(connection, cursor)
 
     def fetch_all(self, query, params=None):
         """Execute a query and fetch all results"""
+        connection = cursor = None
         try:
-            if not self.connection or not self.connection.is_connected():
-                self.connect()
-                
-            self.cursor.execute(query, params or ())
-            return self.cursor.fetchall()
+            connection = self.get_connection()
+            cursor = connection.cursor(dictionary=True)
+            cursor.execute(query, params or ())
+            return cursor.fetchall()
         except Error as e:
             print(f"Error fetching data: {e}")
+            self.check_error(connection, e)
             return []
+        finally:
+            self.release(connection, cursor)
+
+    def fetch_columns(self, query, params=None):
+        """Execute a query and return its results column-wise as {column: [values]}"""
+        connection = cursor = None
+        try:
+            connection = self.get_connection()
+            cursor = connection.cursor()
+            cursor.execute(query, params or ())
+            return to_columns(cursor.column_names, cursor.fetchall())
+        except Error as e:
+            print(f"Error fetching data: {e}")
+            self.check_error(connection, e)
+            return {}
+        finally:
+            self.release(connection, cursor)
+
+    def fetch_all_multi(self, queries, params=None):
+        """Execute several SELECT statements in one round trip
+
+        params covers the placeholders of all statements, in order. Returns one
+        {column: [values]} dict per statement (all empty on error). The batch
+        runs on a separate connection, shared by all threads, which is the
+        only one allowed several statements per query.
+        """
+        with self._multi_lock:
+            cursor = None
+            try:
+                cursor = self.get_multi_connection().cursor()
+                results = []
+                for result in cursor.execute(";\n".join(queries), params or (), multi=True):
+                    if result.with_rows:
+                        results.append(to_columns(result.column_names, result.fetchall()))
+                return results
+            except Error as e:
+                print(f"Error fetching data: {e}")
+                self.check_error(None, e)
+                # Results may be left unread; start over with a fresh connection
+                cursor = None
+                self.reset_multi()
+                return [{} for _ in queries]
+            finally:
+                if cursor is not None:
+                    cursor.close()
+
+    def get_multi_connection(self):
+        """Return the multi-statement connection, opening it on first use
+
+        Like the prepared statement connection, it is only pinged after
+        PING_AFTER_IDLE seconds unused. Call with _multi_lock held.
+        """
+        now = time.monotonic()
+        if (self._multi_connection is not None
+                and now - self._multi_last_used > PING_AFTER_IDLE
+                and not self._multi_connection.is_connected()):
+            self.reset_multi()
+        self._multi_last_used = now
+        
+        if self._multi_connection is None:
+            self.ensure_connected()
+            if self.db_config is None:
+                raise Error("Not connected to MySQL database")
+            self._multi_connection = mysql.connector.connect(
+                client_flags=[ClientFlag.FOUND_ROWS, ClientFlag.MULTI_STATEMENTS], **self.db_config
+            )
+        return self._multi_connection
+
+    def reset_multi(self):
+        """Close the multi-statement connection"""
+        if self._multi_connection is not None:
+            try:
+                self._multi_connection.close()
+            except Error:
+                pass
+            self._multi_connection = None
+
+    def fetch_search(self, fulltext_query, like_query, search_term):
+        """Search with a FULLTEXT query, falling back to a LIKE query
+
+        fulltext_query takes one boolean-mode AGAINST parameter, which gets
+        every word of search_term as a prefix match. like_query is used when
+        that finds nothing (e.g. terms shorter than the FULLTEXT minimum);
+        each of its placeholders gets search_term as a substring pattern.
+        """
+        words = _FULLTEXT_OPERATORS.sub(' ', search_term).split()
+        if words:
+            rows = self.fetch_all(fulltext_query, (' '.join(f"{word}*" for word in words),))
+            if rows:
+                return rows
+        
+        search_param = f"%{search_term}%"
+        return self.fetch_all(like_query, (search_param,) * like_query.count('%s'))
+
+    def fetch_scalar(self, query, params=None):
+        """Execute a query and return the first column of the first row (None if no rows)"""
+        connection = cursor = None
+        try:
+            connection = self.get_connection()
+            cursor = connection.cursor(buffered=True)
+            cursor.execute(query, params or ())
+            row = cursor.fetchone()
+            return row[0] if row else None
+        except Error as e:
+            print(f"Error fetching data: {e}")
+            self.check_error(connection, e)
+            return None
+        finally:
+            self.release(connection, cursor)
+
+    def fetch_iter(self, query, params=None, chunk_size=1000):
+        """Execute a query and yield result rows, fetching chunk_size rows at a time"""
+        connection = cursor = None
+        try:
+            connection = self.get_connection()
+            cursor = connection.cursor(dictionary=True, buffered=False)
+            cursor.execute(query, params or ())
+            while True:
+                rows = cursor.fetchmany(chunk_size)
+                if not rows:
+                    break
+                yield from rows
+        except Error as e:
+            print(f"Error fetching data: {e}")
+            self.check_error(connection, e)
+        finally:
+            # Discard rows left unread if the caller stopped early
+            if (connection is not None and connection is not getattr(self._local, 'broken', None)
+                    and connection.unread_result):
+                connection.consume_results()
+            self.release(connection, cursor)
 
     def fetch_one(self, query, params=None):
         """Execute a query and fetch one result"""
+        connection = cursor = None
         try:
-            if not self.connection or not self.connection.is_connected():
-                self.connect()
-                
-            self.cursor.execute(query, params or ())
-            return self.cursor.fetchone()
+            connection = self.get_connection()
+            cursor = connection.cursor(dictionary=True, buffered=True)
+            cursor.execute(query, params or ())
+            return cursor.fetchone()
         except Error as e:
             print(f"Error fetching data: {e}")
+            self.check_error(connection, e)
             return None
+        finally:
+            self.release(connection, cursor)
+
+    def get_prepared_cursor(self, query):
+        """Return the prepared cursor for query, preparing it on first use
+
+        Prepared statements live on one separate connection shared by all
+        threads, so each thread's connection stays free for plain queries.
+        """
+        # Only ping a long-idle connection; recently used ones are trusted
+        # and any failure resets the connection for the next call
+        now = time.monotonic()
+        if (self._prepared_connection is not None
+                and now - self._prepared_last_used > PING_AFTER_IDLE
+                and not self._prepared_connection.is_connected()):
+            self.reset_prepared()
+        self._prepared_last_used = now
+        
+        if self._prepared_connection is None:
+            self.ensure_connected()
+            if self.db_config is None:
+                raise Error("Not connected to MySQL database")
+            self._prepared_connection = mysql.connector.connect(
+                client_flags=[ClientFlag.FOUND_ROWS], **self.db_config
+            )
+        
+        cursor = self._prepared.get(query)
+        if cursor is None:
+            cursor = self._prepared_connection.cursor(prepared=True, dictionary=True)
+            self._prepared[query] = cursor
+        return cursor
+
+    def reset_prepared(self):
+        """Close the prepared statement connection and forget its statements"""
+        self._prepared.clear()
+        if self._prepared_connection is not None:
+            try:
+                self._prepared_connection.close()
+            except Error:
+                pass
+            self._prepared_connection = None
+
+    def fetch_prepared(self, query, params=None):
+        """Execute a query as a prepared statement and fetch all results"""
+        with self._prepared_lock:
+            try:
+                cursor = self.get_prepared_cursor(query)
+                cursor.execute(query, params or ())
+                return cursor.fetchall()
+            except Error as e:
+                print(f"Error fetching data: {e}")
+                self.reset_prepared()
+                return []
+
+    def execute_prepared(self, query, params=None):
+        """Execute a query as a prepared statement and return the affected row count (-1 on error)
+
+        Prepared statements are committed immediately and do not take part in transaction().
+        """
+        with self._prepared_lock:
+            try:
+                cursor = self.get_prepared_cursor(query)
+                cursor.execute(query, params or ())
+                return cursor.rowcount
+            except Error as e:
+                print(f"Error executing query: {e}")
+                self.reset_prepared()
+                return -1
+
+    def insert_prepared(self, query, params=None):
+        """Execute an INSERT as a prepared statement and return the new row's id (None on error)"""
+        with self._prepared_lock:
+            try:
+                cursor = self.get_prepared_cursor(query)
+                cursor.execute(query, params or ())
+                return cursor.lastrowid
+            except Error as e:
+                print(f"Error executing query: {e}")
+                self.reset_prepared()
+                return None
 
     def close(self):
-        """Close the database connection"""
-        if self.connection and self.connection.is_connected():
-            self.cursor.close()
-            self.connection.close()
+        """Close every thread's database connection"""
+        if self.db_config is not None:
+            with self._connections_lock:
+                connections = list(self._connections)
+            for connection in connections:
+                self.close_connection(connection)
+            self._local = threading.local()
+            self.db_config = None
+            self.reset_prepared()
+            with self._multi_lock:
+                self.reset_multi()
             print("Database connection closed.")
 
 
-# Create a singleton instance for global use
-db = DatabaseConnection()
+def to_columns(column_names, rows):
+    """Transpose tuple rows into a {column: [values]} dict"""
+    if not rows:
+        return {name: [] for name in column_names}
+    return dict(zip(column_names, map(list, zip(*rows))))
+
+
+# Singleton instance for global use, created lazily by get_db()
+db = None
+
+
+def get_db():
+    """Return the shared database connection, creating it on first call"""
+    global db
+    if db is None:
+        db = DatabaseConnection()
+    return db
 
 
 # For testing the connection
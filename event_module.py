@@ -2,54 +2,184 @@
 event_module.py - Event management module for College Event Participation Tracker
 """
 
-from db_connection import db
-from datetime import datetime
+from mysql.connector import Error
+from db_connection import get_db
+from reports import ReportsModule
+from ttl_cache import TTLCache
+from datetime import date
+import re
+
+
+# SQL statements used by EventModule, built once at import time
+_Q_INSERT = """
+INSERT INTO events (name, event_type, department, event_date) 
+VALUES (%s, %s, %s, %s)
+"""
+
+_Q_ALL_EVENTS = """
+SELECT event_id, name, event_type, department, event_date, participant_count
+FROM events
+ORDER BY event_date DESC, event_id DESC
+"""
+
+_Q_ALL_EVENTS_PAGE = _Q_ALL_EVENTS + "LIMIT %s OFFSET %s"
+
+_Q_BY_ID = "SELECT * FROM events WHERE event_id = %s"
+
+_Q_UPDATE = """
+UPDATE events 
+SET name = %s, event_type = %s, department = %s, event_date = %s 
+WHERE event_id = %s
+"""
+
+_Q_DELETE = "DELETE FROM events WHERE event_id = %s"
+
+_Q_SEARCH = """
+SELECT * FROM events 
+WHERE MATCH(name, event_type, department) AGAINST (%s IN BOOLEAN MODE)
+ORDER BY event_date DESC
+"""
+
+_Q_SEARCH_LIKE = """
+SELECT * FROM events 
+WHERE name LIKE %s OR event_type LIKE %s OR department LIKE %s
+ORDER BY event_date DESC
+"""
+
+# Strict YYYY-MM-DD shape; date.fromisoformat then checks the calendar
+_DATE_RE = re.compile(r'^\d{4}-\d{2}-\d{2}$')
+
+_Q_UPCOMING = """
+SELECT * FROM events 
+WHERE event_date >= CURDATE()
+ORDER BY event_date ASC
+"""
+
+_Q_PAST = """
+SELECT * FROM events 
+WHERE event_date < CURDATE()
+ORDER BY event_date DESC
+"""
+
+_Q_SPLIT = """
+SELECT *, (event_date >= CURDATE()) AS is_upcoming
+FROM events 
+ORDER BY event_date ASC
+"""
+
+_Q_BY_DEPT = """
+SELECT * FROM events 
+WHERE department = %s
+ORDER BY event_date DESC
+"""
+
+_Q_PARTICIPANTS = """
+SELECT s.usn, s.name, s.department, s.year, p.performance
+FROM students s
+JOIN participation p ON s.usn = p.usn
+WHERE p.event_id = %s
+ORDER BY p.performance, s.name
+"""
+
+
+def _clear_participation_cache():
+    """Drop ParticipationModule's cached winner and participant lists"""
+    # Imported here: participation_module imports this module
+    from participation_module import ParticipationModule
+    ParticipationModule.clear_cache()
 
 
 class EventModule:
     """Class to handle event-related operations"""
 
+    # Recently fetched events keyed by event_id, shared by all instances
+    _event_cache = TTLCache(maxsize=1024, ttl=30)
+
+    @staticmethod
+    def validate_date(event_date):
+        """Validate date format (YYYY-MM-DD) and that the date exists"""
+        if not _DATE_RE.match(event_date):
+            return False
+        try:
+            date.fromisoformat(event_date)
+        except ValueError:
+            return False
+        return True
+
     def add_event(self, name, event_type, department, event_date):
-        """Add a new event to the database"""
+        """Add a new event to the database
+        
+        Returns (success, message, event_id); event_id is None on failure.
+        """
         # Validate inputs
         if not name or not event_type or not department or not event_date:
-            return False, "All fields are required"
+            return False, "All fields are required", None
         
         # Validate date format
-        try:
-            # Check if the date is in the correct format
-            datetime.strptime(event_date, '%Y-%m-%d')
-        except ValueError:
-            return False, "Invalid date format. Use YYYY-MM-DD"
+        if not self.validate_date(event_date):
+            return False, "Invalid date format. Use YYYY-MM-DD", None
         
         # Insert new event
-        query = """
-        INSERT INTO events (name, event_type, department, event_date) 
-        VALUES (%s, %s, %s, %s)
-        """
-        success = db.execute_query(query, (name, event_type, department, event_date))
+        event_id = get_db().insert_prepared(_Q_INSERT, (name, event_type, department, event_date))
         
-        if success:
-            return True, f"Event '{name}' added successfully"
+        if event_id:
+            return True, f"Event '{name}' added successfully (ID: {event_id})", event_id
         else:
-            return False, "Failed to add event"
-
-    def get_all_events(self):
-        """Get all events with their participation count"""
-        query = """
-        SELECT e.event_id, e.name, e.event_type, e.department, 
-               e.event_date, COUNT(p.id) AS participant_count
-        FROM events e
-        LEFT JOIN participation p ON e.event_id = p.event_id
-        GROUP BY e.event_id, e.name, e.event_type, e.department, e.event_date
-        ORDER BY e.event_date DESC
+            return False, "Failed to add event", None
+
+    def add_events_bulk(self, rows, chunk_size=500):
+        """Add several events using multi-row INSERT statements
+
+        rows is a sequence of (name, event_type, department, event_date) tuples.
+        Rows are sent in chunks of chunk_size to stay under max_allowed_packet.
         """
-        return db.fetch_all(query)
+        rows = list(rows)
+        if not rows:
+            return False, "No events to add"
+
+        # Validate every row before inserting anything
+        for name, event_type, department, event_date in rows:
+            if not name or not event_type or not department or not event_date:
+                return False, "All fields are required"
+            if not self.validate_date(event_date):
+                return False, f"Invalid date format for event '{name}'. Use YYYY-MM-DD"
+
+        # executemany rewrites each chunk into a single multi-row INSERT;
+        # all chunks share one transaction so the rows are committed once
+        db = get_db()
+        try:
+            with db.transaction():
+                for start in range(0, len(rows), chunk_size):
+                    chunk = rows[start:start + chunk_size]
+
+                    if not db.execute_many(_Q_INSERT, chunk):
+                        return False, "Failed to add events"
+        except Error as e:
+            # Starting or committing the transaction failed (e.g. the database is down)
+            print(f"Error executing query: {e}")
+            return False, "Failed to add events"
+
+        return True, f"{len(rows)} events added successfully"
+
+    def get_all_events(self, limit=None, offset=0):
+        """Get all events with their participation count, optionally one page at a time"""
+        if limit is None:
+            return get_db().fetch_all(_Q_ALL_EVENTS)
+        return get_db().fetch_all(_Q_ALL_EVENTS_PAGE, (limit, offset))
 
     def get_event_by_id(self, event_id):
         """Get event details by ID"""
-        query = "SELECT * FROM events WHERE event_id = %s"
-        return db.fetch_one(query, (event_id,))
+        event = self._event_cache.get(event_id)
+        if event is not None:
+            return event
+        
+        rows = get_db().fetch_prepared(_Q_BY_ID, (event_id,))
+        if not rows:
+            return None
+        
+        event = rows[0]
+        self._event_cache[event_id] = event
+        return event
 
     def update_event(self, event_id, name, event_type, department, event_date):
         """Update event information"""
@@ -58,92 +188,64 @@ class EventModule:
             return False, "All fields are required"
         
         # Validate date format
-        try:
-            datetime.strptime(event_date, '%Y-%m-%d')
-        except ValueError:
+        if not self.validate_date(event_date):
             return False, "Invalid date format. Use YYYY-MM-DD"
         
-        # Check if event exists
-        existing = self.get_event_by_id(event_id)
-        if not existing:
-            return False, f"Event with ID {event_id} not found"
-        
-        # Update event
-        query = """
-        UPDATE events 
-        SET name = %s, event_type = %s, department = %s, event_date = %s 
-        WHERE event_id = %s
-        """
-        success = db.execute_query(query, (name, event_type, department, event_date, event_id))
+        # Update event; no matched rows means the event doesn't exist
+        affected = get_db().execute_prepared(_Q_UPDATE, (name, event_type, department, event_date, event_id))
+        self._event_cache.pop(event_id)
+        ReportsModule.clear_cache()
         
-        if success:
-            return True, f"Event '{name}' updated successfully"
-        else:
+        if affected < 0:
             return False, "Failed to update event"
+        if affected == 0:
+            return False, f"Event with ID {event_id} not found"
+        return True, f"Event '{name}' updated successfully"
 
     def delete_event(self, event_id):
         """Delete an event record"""
-        # Check if event exists
-        existing = self.get_event_by_id(event_id)
-        if not existing:
-            return False, f"Event with ID {event_id} not found"
-        
         # Delete event (participation records will be deleted due to CASCADE)
-        query = "DELETE FROM events WHERE event_id = %s"
-        success = db.execute_query(query, (event_id,))
+        affected = get_db().execute_prepared(_Q_DELETE, (event_id,))
+        self._event_cache.pop(event_id)
+        ReportsModule.clear_cache()
+        _clear_participation_cache()
         
-        if success:
-            return True, f"Event '{existing['name']}' deleted successfully"
-        else:
+        if affected < 0:
             return False, "Failed to delete event"
+        if affected == 0:
+            return False, f"Event with ID {event_id} not found"
+        return True, f"Event with ID {event_id} deleted successfully"
 
     def search_events(self, search_term):
         """Search events by name, type, or department"""
-        query = """
-        SELECT * FROM events 
-        WHERE name LIKE %s OR event_type LIKE %s OR department LIKE %s
-        ORDER BY event_date DESC
-        """
-        search_param = f"%{search_term}%"
-        return db.fetch_all(query, (search_param, search_param, search_param))
+        return get_db().fetch_search(_Q_SEARCH, _Q_SEARCH_LIKE, search_term)
 
     def get_upcoming_events(self):
         """Get events that haven't occurred yet"""
-        query = """
-        SELECT * FROM events 
-        WHERE event_date >= CURDATE()
-        ORDER BY event_date ASC
-        """
-        return db.fetch_all(query)
+        return get_db().fetch_all(_Q_UPCOMING)
     
     def get_past_events(self):
         """Get events that have already occurred"""
-        query = """
-        SELECT * FROM events 
-        WHERE event_date < CURDATE()
-        ORDER BY event_date DESC
+        return get_db().fetch_all(_Q_PAST)
+
+    def get_events_split(self):
+        """Get upcoming and past events with a single query
+        
+        Returns (upcoming, past) ordered like get_upcoming_events and get_past_events.
         """
-        return db.fetch_all(query)
+        upcoming, past = [], []
+        for event in get_db().fetch_all(_Q_SPLIT):
+            (upcoming if event.pop('is_upcoming') else past).append(event)
+        past.reverse()
+        return upcoming, past
 
     def get_department_events(self, department):
         """Get events for a specific department"""
-        query = """
-        SELECT * FROM events 
-        WHERE department = %s
-        ORDER BY event_date DESC
-        """
-        return db.fetch_all(query, (department,))
+        return get_db().fetch_prepared(_Q_BY_DEPT, (department,))
     
     def get_event_participants(self, event_id):
-        """Get all participants for an event"""
-        query = """
-        SELECT s.usn, s.name, s.department, s.year, p.performance
-        FROM students s
-        JOIN participation p ON s.usn = p.usn
-        WHERE p.event_id = %s
-        ORDER BY p.performance, s.name
-        """
-        return db.fetch_all(query, (event_id,))
+        """Iterate over all participants for an event, streaming from the server"""
+        return get_db().fetch_iter(_Q_PARTICIPANTS, (event_id,))
 
 
 # For testing the module
@@ -152,7 +254,7 @@ if __name__ == "__main__":
     
     # Example operations for testing
     # Add an event
-    result, message = event_module.add_event("Test Event", "Technical", "Computer Science", "2025-12-25")
+    result, message, test_event_id = event_module.add_event("Test Event", "Technical", "Computer Science", "2025-12-25")
     print(message)
     
     # Get all events
@@ -174,8 +276,7 @@ if __name__ == "__main__":
                                                  event['department'], "2025-12-31")
         print(message)
     
-    # Delete the test event (get its ID first)
-    test_events = event_module.search_events("Test Event")
-    if test_events:
-        result, message = event_module.delete_event(test_events[0]['event_id'])
+    # Delete the test event
+    if test_event_id:
+        result, message = event_module.delete_event(test_event_id)
         print(message)
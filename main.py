@@ -5,11 +5,144 @@ main.py - Main application file for College Event Participation Tracker
 import os
 import sys
 from datetime import datetime
-from db_connection import db
-from student_module import StudentModule
-from event_module import EventModule
-from participation_module import ParticipationModule
-from reports import ReportsModule
+from functools import cached_property
+from itertools import chain
+
+
+# Rows shown per page by the paginated "view all" screens
+PAGE_SIZE = 50
+
+# Performance categories offered when registering or updating participation
+_PERF_MAP = {'1': 'Winner', '2': 'Runner-up', '3': 'Participant'}
+
+# Navigation keys understood by every menu, mapped to display_menu actions
+_MENU_NAV = {'b': 'back', 'q': 'quit'}
+
+class TableLayout:
+    """Fixed-width table layout built from one spec per column
+
+    Each column is a (title, width) or (title, width, conversion) tuple;
+    conversion is a printf-style type such as 'd' or '.2f' and defaults to
+    's'. The header, separator and row formatter all come from these specs.
+    Text wider than its column is cut off, as the SQL-padded RPAD rows are.
+    """
+
+    def __init__(self, *columns):
+        self.titles = tuple(column[0] for column in columns)
+        self.widths = tuple(column[1] for column in columns)
+        self._row_format = " ".join(
+            "%%-%d%s" % (column[1], column[2] if len(column) > 2 else ".%ds" % column[1])
+            for column in columns
+        )
+        self.header = " ".join("%-*s" % (width, title) for title, width in zip(self.titles, self.widths))
+        self.separator = "-" * len(self.header)
+
+    def row(self, *values):
+        """Lay out one row of values"""
+        return self._row_format % values
+
+
+# Table layouts, built once
+_STUDENT_TABLE = TableLayout(('USN', 12), ('Name', 25), ('Department', 20), ('Year', 5), ('Participations', 15))
+_STUDENT_SEARCH_TABLE = TableLayout(('USN', 12), ('Name', 25), ('Department', 20), ('Year', 5))
+_STUDENT_EVENT_TABLE = TableLayout(('Event Name', 30), ('Type', 15), ('Department', 20), ('Date', 12), ('Performance', 12))
+_EVENT_TABLE = TableLayout(('ID', 5), ('Event Name', 30), ('Type', 15), ('Department', 20), ('Date', 12), ('Participants', 12))
+_EVENT_LIST_TABLE = TableLayout(('ID', 5), ('Event Name', 30), ('Type', 15), ('Department', 20), ('Date', 12))
+_PARTICIPANT_TABLE = TableLayout(('USN', 12), ('Name', 25), ('Department', 20), ('Year', 5), ('Performance', 12))
+_PARTICIPATION_TABLE = TableLayout(('Student', 25), ('USN', 12), ('Event', 30), ('Date', 12), ('Performance', 12))
+_WINNER_TABLE = TableLayout(('Performance', 12), ('USN', 12), ('Name', 25), ('Department', 20), ('Year', 5))
+_ACHIEVEMENT_TABLE = TableLayout(('Performance', 12), ('Event Name', 30), ('Type', 15), ('Department', 20), ('Date', 12))
+_TOP_STUDENT_TABLE = TableLayout(('Rank', 5), ('USN', 12), ('Name', 25), ('Department', 20), ('Year', 5), ('Participations', 15))
+_DEPARTMENT_TABLE = TableLayout(('Department', 20), ('Students', 10), ('Events', 10), ('Participations', 15), ('Avg/Student', 12))
+_EVENT_RANK_TABLE = TableLayout(('Rank', 5), ('ID', 5), ('Event Name', 30), ('Type', 15), ('Department', 20), ('Participants', 12))
+_PERFORMANCE_TABLE = TableLayout(('Performance', 12), ('Count', 8, 'd'), ('Percentage', 12))
+_EVENT_TYPE_TABLE = TableLayout(('Event Type', 20), ('Total Events', 15, 'd'), ('Participations', 20, 'd'), ('Avg/Event', 12, '.2f'))
+_MONTHLY_TABLE = TableLayout(('Month', 10), ('Events', 8, 'd'), ('Participants', 15, 'd'), ('Winners', 10, 'd'), ('Runners-up', 12, 'd'))
+_TOP_PERFORMER_TABLE = TableLayout(('Rank', 5, 'd'), ('USN', 12), ('Name', 25), ('Department', 20),
+                                   ('Wins', 6, 'd'), ('Runner-ups', 12, 'd'), ('Total', 6, 'd'))
+
+_MONTHS = ('January', 'February', 'March', 'April', 'May', 'June',
+           'July', 'August', 'September', 'October', 'November', 'December')
+
+# ANSI sequence that clears the screen and moves the cursor home
+CLEAR_SCREEN = "\x1b[2J\x1b[H"
+
+
+def enable_ansi():
+    """Make sure the console understands ANSI escape sequences"""
+    if os.name != 'nt':
+        return True
+    
+    # Windows consoles need virtual terminal processing switched on
+    try:
+        import ctypes
+        kernel32 = ctypes.windll.kernel32
+        handle = kernel32.GetStdHandle(-11)  # STD_OUTPUT_HANDLE
+        mode = ctypes.c_uint32()
+        if not kernel32.GetConsoleMode(handle, ctypes.byref(mode)):
+            return False
+        # ENABLE_VIRTUAL_TERMINAL_PROCESSING
+        return bool(kernel32.SetConsoleMode(handle, mode.value | 0x0004))
+    except (AttributeError, OSError):
+        return False
+
+
+def write_lines(lines):
+    """Write table rows to stdout with a single call"""
+    text = "\n".join(lines) + "\n"
+    
+    # Hand the encoded rows straight to the binary buffer, skipping the
+    # text layer's per-write newline and buffering work
+    buffer = getattr(sys.stdout, 'buffer', None)
+    if buffer is None:
+        sys.stdout.write(text)
+        return
+    
+    # Flush pending text first so rows stay after anything already printed
+    sys.stdout.flush()
+    buffer.write(text.encode(sys.stdout.encoding or 'utf-8', sys.stdout.errors or 'strict'))
+    buffer.flush()
+
+
+def write_final(text):
+    """Write a last message straight to the stdout file descriptor before exiting
+
+    Falls back to sys.stdout.write when stdout has no usable descriptor
+    (e.g. it was replaced by an in-memory stream). If the reader has gone
+    away (a closed pipe) the message is dropped quietly.
+    """
+    try:
+        # Anything still buffered must come out first
+        sys.stdout.flush()
+        try:
+            fd = sys.stdout.fileno()
+        except (AttributeError, OSError, ValueError):
+            sys.stdout.write(text)
+            sys.stdout.flush()
+            return
+        
+        # os.write may accept only part of the data, e.g. on a full pipe
+        data = memoryview(text.encode(sys.stdout.encoding or 'utf-8', 'replace'))
+        while data:
+            data = data[os.write(fd, data):]
+    except OSError:
+        # Point stdout at devnull so the flush at interpreter exit doesn't fail again
+        try:
+            os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        except (AttributeError, OSError, ValueError):
+            pass
+
+
+def write_batched(lines, batch_size=100):
+    """Write table rows from an iterable to stdout, batch_size rows per call"""
+    batch = []
+    for line in lines:
+        batch.append(line)
+        if len(batch) == batch_size:
+            write_lines(batch)
+            batch = []
+    if batch:
+        write_lines(batch)
 
 
 class CollegeEventTracker:
@@ -17,10 +150,8 @@ class CollegeEventTracker:
     
     def __init__(self):
         """Initialize application components"""
-        self.student_module = StudentModule()
-        self.event_module = EventModule()
-        self.participation_module = ParticipationModule()
-        self.reports_module = ReportsModule()
+        # Clear the screen with escape codes where the console supports them
+        self.ansi_enabled = enable_ansi()
         
         # Define menu options
         self.main_menu = {
@@ -31,6 +162,47 @@ class CollegeEventTracker:
             'q': ('Quit', self.quit_application)
         }
         
+        # Submenus, built once and reused on every visit
+        self._student_menu = {
+            '1': ('Add New Student', self.add_student),
+            '2': ('View All Students', self.view_all_students),
+            '3': ('Search Students', self.search_students),
+            '4': ('Update Student Details', self.update_student),
+            '5': ('Delete Student', self.delete_student),
+            '6': ('View Student Events', self.view_student_events)
+        }
+        
+        self._event_menu = {
+            '1': ('Add New Event', self.add_event),
+            '2': ('View All Events', self.view_all_events),
+            '3': ('Search Events', self.search_events),
+            '4': ('Update Event Details', self.update_event),
+            '5': ('Delete Event', self.delete_event),
+            '6': ('View Event Participants', self.view_event_participants),
+            '7': ('View Upcoming Events', self.view_upcoming_events),
+            '8': ('View Past Events', self.view_past_events)
+        }
+        
+        self._participation_menu = {
+            '1': ('Register Student for Event', self.register_participation),
+            '2': ('View All Participations', self.view_all_participations),
+            '3': ('Update Student Performance', self.update_performance),
+            '4': ('Remove Participation', self.remove_participation),
+            '5': ('View Event Winners', self.view_event_winners),
+            '6': ('View Student Achievements', self.view_student_achievements)
+        }
+        
+        self._reports_menu = {
+            '1': ('Top Participating Students', self.show_top_students),
+            '2': ('Department-wise Participation', self.show_department_participation),
+            '3': ('Events by Participation', self.show_events_by_participation),
+            '4': ('Performance Summary', self.show_performance_summary),
+            '5': ('Event Type Statistics', self.show_event_type_statistics),
+            '6': ('Monthly Event Summary', self.show_monthly_summary),
+            '7': ('Top Performers', self.show_top_performers),
+            '8': ('Generate Comprehensive Report', self.generate_comprehensive_report)
+        }
+        
         # Welcome message shown at startup
         self.welcome_message = """
         =====================================================
@@ -43,12 +215,72 @@ class CollegeEventTracker:
         =====================================================
         """
     
+    # Feature modules are imported on first use so the welcome screen doesn't
+    # wait for the MySQL driver to load
+    @cached_property
+    def student_module(self):
+        from student_module import StudentModule
+        return StudentModule()
+    
+    @cached_property
+    def event_module(self):
+        from event_module import EventModule
+        return EventModule()
+    
+    @cached_property
+    def participation_module(self):
+        from participation_module import ParticipationModule
+        return ParticipationModule()
+    
+    @cached_property
+    def reports_module(self):
+        from reports import ReportsModule
+        return ReportsModule()
+    
     def clear_screen(self):
         """Clear the console screen"""
-        os.system('cls' if os.name == 'nt' else 'clear')
+        if self.ansi_enabled:
+            sys.stdout.write(CLEAR_SCREEN)
+            sys.stdout.flush()
+        else:
+            os.system('cls')
+    
+    def _read_key(self, prompt=""):
+        """Show prompt and return a single keystroke without waiting for Enter"""
+        sys.stdout.write(prompt)
+        sys.stdout.flush()
+        
+        # Piped or redirected input has no terminal modes to change
+        if not sys.stdin.isatty():
+            line = sys.stdin.readline()
+            if not line:
+                # Input ran out; stop like input() does instead of re-prompting forever
+                raise EOFError("no more input")
+            return line[:1]
+        
+        if os.name == 'nt':
+            import msvcrt
+            key = msvcrt.getwch()
+        else:
+            import termios
+            import tty
+            fd = sys.stdin.fileno()
+            old_settings = termios.tcgetattr(fd)
+            try:
+                tty.setcbreak(fd)
+                key = sys.stdin.read(1)
+            finally:
+                termios.tcsetattr(fd, termios.TCSADRAIN, old_settings)
+        
+        # Echo the key so the screen reads like a normal prompt
+        sys.stdout.write(key.strip() + "\n")
+        return key
     
     def display_menu(self, menu_options, title=None):
-        """Display a menu with options"""
+        """Display a menu and read a choice
+        
+        Returns the chosen menu function, 'back', 'quit', or None for an invalid choice.
+        """
         self.clear_screen()
         
         if title:
@@ -59,52 +291,82 @@ class CollegeEventTracker:
             print(f"{key}. {option}")
         
         print("\n(Press 'b' to go back to previous menu, 'q' to quit)")
-        choice = input("\nEnter your choice: ").lower()
-        return choice
+        choice = self._read_key("\nEnter your choice: ").strip().lower()
+        
+        entry = menu_options.get(choice)
+        if entry is not None:
+            return entry[1]
+        return _MENU_NAV.get(choice)
+    
+    def run_submenu(self, menu_options, title):
+        """Loop over a submenu until the user goes back"""
+        while True:
+            action = self.display_menu(menu_options, title)
+            
+            if action is None:
+                self._read_key("Invalid choice. Press any key to continue...")
+            elif action == 'back':
+                break
+            elif action == 'quit':
+                self.quit_application()
+            else:
+                action()
+                self._read_key("\nPress any key to continue...")
+    
+    def page_through(self, fetch_page, show_page, empty_message):
+        """Show rows from fetch_page(limit, offset) one page at a time"""
+        page = 0
+        
+        while True:
+            # Fetch one extra row to find out whether another page follows
+            rows = fetch_page(limit=PAGE_SIZE + 1, offset=page * PAGE_SIZE)
+            if not rows:
+                if page == 0:
+                    print(empty_message)
+                return
+            
+            has_next = len(rows) > PAGE_SIZE
+            show_page(rows[:PAGE_SIZE])
+            
+            if page == 0 and not has_next:
+                return
+            
+            options = []
+            if has_next:
+                options.append("[n]ext")
+            if page > 0:
+                options.append("[p]rev")
+            options.append("[q]uit")
+            
+            choice = input(f"\nPage {page + 1} - {' / '.join(options)}: ").strip().lower()
+            if choice == 'n' and has_next:
+                page += 1
+            elif choice == 'p' and page > 0:
+                page -= 1
+            elif choice == 'q':
+                return
     
     def run(self):
         """Run the main application loop"""
         # Display welcome message once at startup
         print(self.welcome_message)
-        input("Press Enter to continue...")
+        self._read_key("Press any key to continue...")
         
         while True:
-            choice = self.display_menu(self.main_menu, "MAIN MENU")
+            action = self.display_menu(self.main_menu, "MAIN MENU")
             
-            if choice in self.main_menu:
-                _, function = self.main_menu[choice]
-                function()
-            elif choice == 'b':
+            if action is None:
+                self._read_key("Invalid choice. Press any key to continue...")
+            elif action == 'back':
                 continue  # Stay in main menu
-            elif choice == 'q':
+            elif action == 'quit':
                 self.quit_application()
             else:
-                input("Invalid choice. Press Enter to continue...")
+                action()
     
     def student_menu(self):
         """Display student management menu"""
-        menu = {
-            '1': ('Add New Student', self.add_student),
-            '2': ('View All Students', self.view_all_students),
-            '3': ('Search Students', self.search_students),
-            '4': ('Update Student Details', self.update_student),
-            '5': ('Delete Student', self.delete_student),
-            '6': ('View Student Events', self.view_student_events)
-        }
-        
-        while True:
-            choice = self.display_menu(menu, "STUDENT MANAGEMENT")
-            
-            if choice in menu:
-                _, function = menu[choice]
-                function()
-                input("\nPress Enter to continue...")
-            elif choice == 'b':
-                break
-            elif choice == 'q':
-                self.quit_application()
-            else:
-                input("Invalid choice. Press Enter to continue...")
+        self.run_submenu(self._student_menu, "STUDENT MANAGEMENT")
     
     def add_student(self):
         """Add a new student"""
@@ -120,22 +382,22 @@ class CollegeEventTracker:
         print(f"\n{'SUCCESS' if success else 'ERROR'}: {message}")
     
     def view_all_students(self):
-        """View all students"""
+        """View all students, one page at a time"""
         print("\nALL STUDENTS")
         print("============")
         
-        students = self.student_module.get_all_students()
+        fmt = _STUDENT_TABLE.row
         
-        if not students:
-            print("No students found in the database.")
-            return
-        
-        # Display students in a tabular format
-        print(f"{'USN':<12} {'Name':<25} {'Department':<20} {'Year':<5} {'Participations':<15}")
-        print("-" * 80)
+        def show_page(students):
+            # Display students in a tabular format
+            print(_STUDENT_TABLE.header)
+            print(_STUDENT_TABLE.separator)
+            
+            write_lines([fmt(s['usn'], s['name'], s['department'], s['year'], s['participation_count'])
+                         for s in students])
         
-        for student in students:
-            print(f"{student['usn']:<12} {student['name']:<25} {student['department']:<20} {student['year']:<5} {student['participation_count']:<15}")
+        self.page_through(self.student_module.get_all_students, show_page,
+                          "No students found in the database.")
     
     def search_students(self):
         """Search for students"""
@@ -156,22 +418,19 @@ class CollegeEventTracker:
         
         # Display search results
         print(f"\nSearch Results for '{search_term}':")
-        print(f"{'USN':<12} {'Name':<25} {'Department':<20} {'Year':<5}")
-        print("-" * 65)
+        print(_STUDENT_SEARCH_TABLE.header)
+        print(_STUDENT_SEARCH_TABLE.separator)
         
-        for student in students:
-            print(f"{student['usn']:<12} {student['name']:<25} {student['department']:<20} {student['year']:<5}")
+        fmt = _STUDENT_SEARCH_TABLE.row
+        write_lines([fmt(s['usn'], s['name'], s['department'], s['year']) for s in students])
     
     def update_student(self):
         """Update student details"""
         print("\nUPDATE STUDENT")
         print("==============")
         
-        usn = input("Enter USN of student to update: ").strip().upper()
-        
-        student = self.student_module.get_student_by_usn(usn)
-        if not student:
-            print(f"No student found with USN: {usn}")
+        usn, student = self._prompt_student("Enter USN of student to update: ")
+        if student is None:
             return
         
         print(f"\nCurrent details for {student['name']}:")
@@ -193,15 +452,14 @@ class CollegeEventTracker:
         print("\nDELETE STUDENT")
         print("==============")
         
-        usn = input("Enter USN of student to delete: ").strip().upper()
-        
-        student = self.student_module.get_student_by_usn(usn)
-        if not student:
-            print(f"No student found with USN: {usn}")
+        usn, student = self._prompt_student("Enter USN of student to delete: ")
+        if student is None:
             return
         
-        print(f"\nYou are about to delete: {student['name']} ({student['usn']})")
-        confirm = input("Are you sure? This action cannot be undone. (y/n): ").lower()
+        confirm = input("\n".join([
+            f"\nYou are about to delete: {student['name']} ({student['usn']})",
+            "Are you sure? This action cannot be undone. (y/n): "
+        ])).lower()
         
         if confirm == 'y':
             success, message = self.student_module.delete_student(usn)
@@ -214,11 +472,8 @@ class CollegeEventTracker:
         print("\nVIEW STUDENT EVENTS")
         print("===================")
         
-        usn = input("Enter USN: ").strip().upper()
-        
-        student = self.student_module.get_student_by_usn(usn)
-        if not student:
-            print(f"No student found with USN: {usn}")
+        usn, student = self._prompt_student("Enter USN: ")
+        if student is None:
             return
         
         events = self.student_module.get_student_events(usn)
@@ -227,38 +482,48 @@ class CollegeEventTracker:
             return
         
         print(f"\nEvents participated by {student['name']}:")
-        print(f"{'Event Name':<30} {'Type':<15} {'Department':<20} {'Date':<12} {'Performance':<12}")
-        print("-" * 90)
+        print(_STUDENT_EVENT_TABLE.header)
+        print(_STUDENT_EVENT_TABLE.separator)
         
-        for event in events:
-            print(f"{event['name']:<30} {event['event_type']:<15} {event['department']:<20} {event['event_date'].strftime('%Y-%m-%d'):<12} {event['performance']:<12}")
+        fmt = _STUDENT_EVENT_TABLE.row
+        write_lines([fmt(e['name'], e['event_type'], e['department'], e['event_date'].isoformat()[:10], e['performance'])
+                     for e in events])
+    
+    def _prompt_event_id(self, prompt="Enter Event ID: "):
+        """Ask for an event ID; returns None (after telling the user) if it isn't a number"""
+        event_id = input(prompt).strip()
+        
+        try:
+            return int(event_id)
+        except ValueError:
+            print("Event ID must be a number.")
+            return None
+    
+    def _prompt_event(self, prompt="Enter Event ID: "):
+        """Ask for an event ID and look it up; returns (event_id, event) or (None, None)"""
+        event_id = self._prompt_event_id(prompt)
+        if event_id is None:
+            return None, None
+        
+        event = self.event_module.get_event_by_id(event_id)
+        if not event:
+            print(f"No event found with ID: {event_id}")
+            return None, None
+        return event_id, event
+    
+    def _prompt_student(self, prompt="Enter USN: "):
+        """Ask for a USN and look the student up; returns (usn, student) or (None, None)"""
+        usn = input(prompt).strip().upper()
+        
+        student = self.student_module.get_student_by_usn(usn)
+        if not student:
+            print(f"No student found with USN: {usn}")
+            return None, None
+        return usn, student
     
     def event_menu(self):
         """Display event management menu"""
-        menu = {
-            '1': ('Add New Event', self.add_event),
-            '2': ('View All Events', self.view_all_events),
-            '3': ('Search Events', self.search_events),
-            '4': ('Update Event Details', self.update_event),
-            '5': ('Delete Event', self.delete_event),
-            '6': ('View Event Participants', self.view_event_participants),
-            '7': ('View Upcoming Events', self.view_upcoming_events),
-            '8': ('View Past Events', self.view_past_events)
-        }
-        
-        while True:
-            choice = self.display_menu(menu, "EVENT MANAGEMENT")
-            
-            if choice in menu:
-                _, function = menu[choice]
-                function()
-                input("\nPress Enter to continue...")
-            elif choice == 'b':
-                break
-            elif choice == 'q':
-                self.quit_application()
-            else:
-                input("Invalid choice. Press Enter to continue...")
+        self.run_submenu(self._event_menu, "EVENT MANAGEMENT")
     
     def add_event(self):
         """Add a new event"""
@@ -272,32 +537,31 @@ class CollegeEventTracker:
         # Date input with validation
         while True:
             date_str = input("Enter Event Date (YYYY-MM-DD): ").strip()
-            try:
-                datetime.strptime(date_str, '%Y-%m-%d')
+            if self.event_module.validate_date(date_str):
                 break
-            except ValueError:
-                print("Invalid date format. Please use YYYY-MM-DD.")
+            print("Invalid date format. Please use YYYY-MM-DD.")
         
-        success, message = self.event_module.add_event(name, event_type, department, date_str)
+        success, message, _ = self.event_module.add_event(name, event_type, department, date_str)
         print(f"\n{'SUCCESS' if success else 'ERROR'}: {message}")
     
     def view_all_events(self):
-        """View all events"""
+        """View all events, one page at a time"""
         print("\nALL EVENTS")
         print("==========")
         
-        events = self.event_module.get_all_events()
-        
-        if not events:
-            print("No events found in the database.")
-            return
+        fmt = _EVENT_TABLE.row
         
-        # Display events in a tabular format
-        print(f"{'ID':<5} {'Event Name':<30} {'Type':<15} {'Department':<20} {'Date':<12} {'Participants':<12}")
-        print("-" * 95)
+        def show_page(events):
+            # Display events in a tabular format
+            print(_EVENT_TABLE.header)
+            print(_EVENT_TABLE.separator)
+            
+            write_lines([fmt(e['event_id'], e['name'], e['event_type'], e['department'],
+                             e['event_date'].isoformat()[:10], e['participant_count'])
+                         for e in events])
         
-        for event in events:
-            print(f"{event['event_id']:<5} {event['name']:<30} {event['event_type']:<15} {event['department']:<20} {event['event_date'].strftime('%Y-%m-%d'):<12} {event['participant_count']:<12}")
+        self.page_through(self.event_module.get_all_events, show_page,
+                          "No events found in the database.")
     
     def search_events(self):
         """Search for events"""
@@ -318,28 +582,20 @@ class CollegeEventTracker:
         
         # Display search results
         print(f"\nSearch Results for '{search_term}':")
-        print(f"{'ID':<5} {'Event Name':<30} {'Type':<15} {'Department':<20} {'Date':<12}")
-        print("-" * 85)
+        print(_EVENT_LIST_TABLE.header)
+        print(_EVENT_LIST_TABLE.separator)
         
-        for event in events:
-            print(f"{event['event_id']:<5} {event['name']:<30} {event['event_type']:<15} {event['department']:<20} {event['event_date'].strftime('%Y-%m-%d'):<12}")
+        fmt = _EVENT_LIST_TABLE.row
+        write_lines([fmt(e['event_id'], e['name'], e['event_type'], e['department'], e['event_date'].isoformat()[:10])
+                     for e in events])
     
     def update_event(self):
         """Update event details"""
         print("\nUPDATE EVENT")
         print("============")
         
-        event_id = input("Enter Event ID to update: ").strip()
-        
-        try:
-            event_id = int(event_id)
-        except ValueError:
-            print("Event ID must be a number.")
-            return
-        
-        event = self.event_module.get_event_by_id(event_id)
-        if not event:
-            print(f"No event found with ID: {event_id}")
+        event_id, event = self._prompt_event("Enter Event ID to update: ")
+        if event is None:
             return
         
         print(f"\nCurrent details for '{event['name']}':")
@@ -347,7 +603,7 @@ class CollegeEventTracker:
         print(f"Name: {event['name']}")
         print(f"Type: {event['event_type']}")
         print(f"Department: {event['department']}")
-        print(f"Date: {event['event_date'].strftime('%Y-%m-%d')}")
+        print(f"Date: {event['event_date'].isoformat()[:10]}")
         
         print("\nEnter new details (press Enter to keep current value):")
         new_name = input(f"Name [{event['name']}]: ").strip() or event['name']
@@ -356,13 +612,11 @@ class CollegeEventTracker:
         
         # Date input with validation
         while True:
-            default_date = event['event_date'].strftime('%Y-%m-%d')
+            default_date = event['event_date'].isoformat()[:10]
             new_date = input(f"Date [{default_date}]: ").strip() or default_date
-            try:
-                datetime.strptime(new_date, '%Y-%m-%d')
+            if self.event_module.validate_date(new_date):
                 break
-            except ValueError:
-                print("Invalid date format. Please use YYYY-MM-DD.")
+            print("Invalid date format. Please use YYYY-MM-DD.")
         
         success, message = self.event_module.update_event(event_id, new_name, new_type, new_dept, new_date)
         print(f"\n{'SUCCESS' if success else 'ERROR'}: {message}")
@@ -372,22 +626,15 @@ class CollegeEventTracker:
         print("\nDELETE EVENT")
         print("============")
         
-        event_id = input("Enter Event ID to delete: ").strip()
-        
-        try:
-            event_id = int(event_id)
-        except ValueError:
-            print("Event ID must be a number.")
-            return
-        
-        event = self.event_module.get_event_by_id(event_id)
-        if not event:
-            print(f"No event found with ID: {event_id}")
+        event_id, event = self._prompt_event("Enter Event ID to delete: ")
+        if event is None:
             return
         
-        print(f"\nYou are about to delete: {event['name']} (ID: {event['event_id']})")
-        print("This will also delete all participation records for this event.")
-        confirm = input("Are you sure? This action cannot be undone. (y/n): ").lower()
+        confirm = input("\n".join([
+            f"\nYou are about to delete: {event['name']} (ID: {event['event_id']})",
+            "This will also delete all participation records for this event.",
+            "Are you sure? This action cannot be undone. (y/n): "
+        ])).lower()
         
         if confirm == 'y':
             success, message = self.event_module.delete_event(event_id)
@@ -400,30 +647,22 @@ class CollegeEventTracker:
         print("\nVIEW EVENT PARTICIPANTS")
         print("=======================")
         
-        event_id = input("Enter Event ID: ").strip()
-        
-        try:
-            event_id = int(event_id)
-        except ValueError:
-            print("Event ID must be a number.")
+        event_id, event = self._prompt_event("Enter Event ID: ")
+        if event is None:
             return
         
-        event = self.event_module.get_event_by_id(event_id)
-        if not event:
-            print(f"No event found with ID: {event_id}")
-            return
-        
-        participants = self.event_module.get_event_participants(event_id)
+        participants = self.participation_module.get_event_participants(event_id)
         if not participants:
             print(f"No participants registered for '{event['name']}'.")
             return
         
-        print(f"\nParticipants for '{event['name']}' on {event['event_date'].strftime('%Y-%m-%d')}:")
-        print(f"{'USN':<12} {'Name':<25} {'Department':<20} {'Year':<5} {'Performance':<12}")
-        print("-" * 80)
+        print(f"\nParticipants for '{event['name']}' on {event['event_date'].isoformat()[:10]}:")
+        print(_PARTICIPANT_TABLE.header)
+        print(_PARTICIPANT_TABLE.separator)
         
-        for participant in participants:
-            print(f"{participant['usn']:<12} {participant['name']:<25} {participant['department']:<20} {participant['year']:<5} {participant['performance']:<12}")
+        fmt = _PARTICIPANT_TABLE.row
+        write_lines([fmt(p['usn'], p['name'], p['department'], p['year'], p['performance'])
+                     for p in participants])
     
     def view_upcoming_events(self):
         """View upcoming events"""
@@ -436,11 +675,12 @@ class CollegeEventTracker:
             print("No upcoming events found.")
             return
         
-        print(f"{'ID':<5} {'Event Name':<30} {'Type':<15} {'Department':<20} {'Date':<12}")
-        print("-" * 85)
+        print(_EVENT_LIST_TABLE.header)
+        print(_EVENT_LIST_TABLE.separator)
         
-        for event in events:
-            print(f"{event['event_id']:<5} {event['name']:<30} {event['event_type']:<15} {event['department']:<20} {event['event_date'].strftime('%Y-%m-%d'):<12}")
+        fmt = _EVENT_LIST_TABLE.row
+        write_lines([fmt(e['event_id'], e['name'], e['event_type'], e['department'], e['event_date'].isoformat()[:10])
+                     for e in events])
     
     def view_past_events(self):
         """View past events"""
@@ -453,36 +693,16 @@ class CollegeEventTracker:
             print("No past events found.")
             return
         
-        print(f"{'ID':<5} {'Event Name':<30} {'Type':<15} {'Department':<20} {'Date':<12}")
-        print("-" * 85)
+        print(_EVENT_LIST_TABLE.header)
+        print(_EVENT_LIST_TABLE.separator)
         
-        for event in events:
-            print(f"{event['event_id']:<5} {event['name']:<30} {event['event_type']:<15} {event['department']:<20} {event['event_date'].strftime('%Y-%m-%d'):<12}")
+        fmt = _EVENT_LIST_TABLE.row
+        write_lines([fmt(e['event_id'], e['name'], e['event_type'], e['department'], e['event_date'].isoformat()[:10])
+                     for e in events])
     
     def participation_menu(self):
         """Display participation management menu"""
-        menu = {
-            '1': ('Register Student for Event', self.register_participation),
-            '2': ('View All Participations', self.view_all_participations),
-            '3': ('Update Student Performance', self.update_performance),
-            '4': ('Remove Participation', self.remove_participation),
-            '5': ('View Event Winners', self.view_event_winners),
-            '6': ('View Student Achievements', self.view_student_achievements)
-        }
-        
-        while True:
-            choice = self.display_menu(menu, "PARTICIPATION MANAGEMENT")
-            
-            if choice in menu:
-                _, function = menu[choice]
-                function()
-                input("\nPress Enter to continue...")
-            elif choice == 'b':
-                break
-            elif choice == 'q':
-                self.quit_application()
-            else:
-                input("Invalid choice. Press Enter to continue...")
+        self.run_submenu(self._participation_menu, "PARTICIPATION MANAGEMENT")
     
     def register_participation(self):
         """Register a student for an event"""
@@ -490,56 +710,53 @@ class CollegeEventTracker:
         print("=====================")
         
         usn = input("Enter Student USN: ").strip().upper()
-        student = self.student_module.get_student_by_usn(usn)
-        if not student:
-            print(f"No student found with USN: {usn}")
+        event_id = self._prompt_event_id()
+        if event_id is None:
             return
         
-        event_id = input("Enter Event ID: ").strip()
-        try:
-            event_id = int(event_id)
-        except ValueError:
-            print("Event ID must be a number.")
+        context = self.participation_module.lookup_context(usn, event_id)
+        if not context['student']:
+            print(f"No student found with USN: {usn}")
             return
         
-        event = self.event_module.get_event_by_id(event_id)
-        if not event:
+        if not context['event']:
             print(f"No event found with ID: {event_id}")
             return
         
-        print("\nPerformance Categories:")
-        print("1. Winner")
-        print("2. Runner-up")
-        print("3. Participant")
+        performance = self._prompt_performance("\nSelect performance (default: Participant): ")
         
-        performance_choice = input("\nSelect performance (default: Participant): ").strip()
+        success, message = self.participation_module.register_participation(usn, event_id, performance, context)
+        print(f"\n{'SUCCESS' if success else 'ERROR'}: {message}")
+    
+    def _prompt_performance(self, prompt, warn_invalid=False):
+        """Ask for a performance category, defaulting to Participant"""
+        print("\nPerformance Categories:")
+        for key, performance in _PERF_MAP.items():
+            print(f"{key}. {performance}")
         
-        if performance_choice == '1':
-            performance = "Winner"
-        elif performance_choice == '2':
-            performance = "Runner-up"
-        else:
+        performance = _PERF_MAP.get(input(prompt).strip())
+        if performance is None:
+            if warn_invalid:
+                print("Invalid choice. Using 'Participant' as default.")
             performance = "Participant"
-        
-        success, message = self.participation_module.register_participation(usn, event_id, performance)
-        print(f"\n{'SUCCESS' if success else 'ERROR'}: {message}")
+        return performance
     
     def view_all_participations(self):
-        """View all participation records"""
+        """View all participation records, one page at a time"""
         print("\nALL PARTICIPATIONS")
         print("=================")
         
-        participations = self.participation_module.get_all_participations()
-        
-        if not participations:
-            print("No participation records found.")
-            return
+        fmt = _PARTICIPATION_TABLE.row
         
-        print(f"{'Student':<25} {'USN':<12} {'Event':<30} {'Date':<12} {'Performance':<12}")
-        print("-" * 95)
+        def show_page(participations):
+            print(_PARTICIPATION_TABLE.header)
+            print(_PARTICIPATION_TABLE.separator)
+            
+            write_lines([fmt(p['student_name'], p['usn'], p['event_name'], p['event_date'].isoformat()[:10], p['performance'])
+                         for p in participations])
         
-        for p in participations:
-            print(f"{p['student_name']:<25} {p['usn']:<12} {p['event_name']:<30} {p['event_date'].strftime('%Y-%m-%d'):<12} {p['performance']:<12}")
+        self.page_through(self.participation_module.get_all_participations, show_page,
+                          "No participation records found.")
     
     def update_performance(self):
         """Update student performance in an event"""
@@ -547,44 +764,25 @@ class CollegeEventTracker:
         print("=================")
         
         usn = input("Enter Student USN: ").strip().upper()
-        event_id = input("Enter Event ID: ").strip()
-        
-        try:
-            event_id = int(event_id)
-        except ValueError:
-            print("Event ID must be a number.")
+        event_id = self._prompt_event_id()
+        if event_id is None:
             return
         
         # Check if participation exists
-        participation = self.participation_module.get_participation(usn, event_id)
+        context = self.participation_module.lookup_context(usn, event_id)
+        participation = context['participation']
         if not participation:
             print("No participation record found for this student and event.")
             return
         
-        student = self.student_module.get_student_by_usn(usn)
-        event = self.event_module.get_event_by_id(event_id)
+        student, event = context['student'], context['event']
         
         print(f"\nUpdating performance for {student['name']} in {event['name']}")
         print("Current performance:", participation['performance'])
         
-        print("\nPerformance Categories:")
-        print("1. Winner")
-        print("2. Runner-up")
-        print("3. Participant")
-        
-        performance_choice = input("\nSelect new performance: ").strip()
-        
-        if performance_choice == '1':
-            performance = "Winner"
-        elif performance_choice == '2':
-            performance = "Runner-up"
-        elif performance_choice == '3':
-            performance = "Participant"
-        else:
-            print("Invalid choice. Using 'Participant' as default.")
-            performance = "Participant"
+        performance = self._prompt_performance("\nSelect new performance: ", warn_invalid=True)
         
-        success, message = self.participation_module.update_performance(usn, event_id, performance)
+        success, message = self.participation_module.update_performance(usn, event_id, performance, context)
         print(f"\n{'SUCCESS' if success else 'ERROR'}: {message}")
     
     def remove_participation(self):
@@ -593,28 +791,25 @@ class CollegeEventTracker:
         print("===================")
         
         usn = input("Enter Student USN: ").strip().upper()
-        event_id = input("Enter Event ID: ").strip()
-        
-        try:
-            event_id = int(event_id)
-        except ValueError:
-            print("Event ID must be a number.")
+        event_id = self._prompt_event_id()
+        if event_id is None:
             return
         
         # Check if participation exists
-        participation = self.participation_module.get_participation(usn, event_id)
-        if not participation:
+        context = self.participation_module.lookup_context(usn, event_id)
+        if not context['participation']:
             print("No participation record found for this student and event.")
             return
         
-        student = self.student_module.get_student_by_usn(usn)
-        event = self.event_module.get_event_by_id(event_id)
+        student, event = context['student'], context['event']
         
-        print(f"\nYou are about to remove {student['name']} from {event['name']}")
-        confirm = input("Are you sure? (y/n): ").lower()
+        confirm = input("\n".join([
+            f"\nYou are about to remove {student['name']} from {event['name']}",
+            "Are you sure? (y/n): "
+        ])).lower()
         
         if confirm == 'y':
-            success, message = self.participation_module.delete_participation(usn, event_id)
+            success, message = self.participation_module.delete_participation(usn, event_id, context)
             print(f"\n{'SUCCESS' if success else 'ERROR'}: {message}")
         else:
             print("\nOperation cancelled.")
@@ -624,17 +819,8 @@ class CollegeEventTracker:
         print("\nEVENT WINNERS")
         print("=============")
         
-        event_id = input("Enter Event ID: ").strip()
-        
-        try:
-            event_id = int(event_id)
-        except ValueError:
-            print("Event ID must be a number.")
-            return
-        
-        event = self.event_module.get_event_by_id(event_id)
-        if not event:
-            print(f"No event found with ID: {event_id}")
+        event_id, event = self._prompt_event("Enter Event ID: ")
+        if event is None:
             return
         
         winners = self.participation_module.get_event_winners(event_id)
@@ -642,23 +828,20 @@ class CollegeEventTracker:
             print(f"No winners or runners-up recorded for '{event['name']}'.")
             return
         
-        print(f"\nWinners for '{event['name']}' on {event['event_date'].strftime('%Y-%m-%d')}:")
-        print(f"{'Performance':<12} {'USN':<12} {'Name':<25} {'Department':<20} {'Year':<5}")
-        print("-" * 80)
+        print(f"\nWinners for '{event['name']}' on {event['event_date'].isoformat()[:10]}:")
+        print(_WINNER_TABLE.header)
+        print(_WINNER_TABLE.separator)
         
-        for winner in winners:
-            print(f"{winner['performance']:<12} {winner['usn']:<12} {winner['name']:<25} {winner['department']:<20} {winner['year']:<5}")
+        fmt = _WINNER_TABLE.row
+        write_lines([fmt(w['performance'], w['usn'], w['name'], w['department'], w['year']) for w in winners])
     
     def view_student_achievements(self):
         """View a student's achievements"""
         print("\nSTUDENT ACHIEVEMENTS")
         print("===================")
         
-        usn = input("Enter Student USN: ").strip().upper()
-        
-        student = self.student_module.get_student_by_usn(usn)
-        if not student:
-            print(f"No student found with USN: {usn}")
+        usn, student = self._prompt_student("Enter Student USN: ")
+        if student is None:
             return
         
         achievements = self.participation_module.get_student_achievements(usn)
@@ -667,38 +850,16 @@ class CollegeEventTracker:
             return
         
         print(f"\nAchievements for {student['name']}:")
-        print(f"{'Performance':<12} {'Event Name':<30} {'Type':<15} {'Department':<20} {'Date':<12}")
-        print("-" * 95)
+        print(_ACHIEVEMENT_TABLE.header)
+        print(_ACHIEVEMENT_TABLE.separator)
         
-        for achievement in achievements:
-            print(f"{achievement['performance']:<12} {achievement['name']:<30} {achievement['event_type']:<15} {achievement['department']:<20} {achievement['event_date'].strftime('%Y-%m-%d'):<12}")
+        fmt = _ACHIEVEMENT_TABLE.row
+        write_lines([fmt(a['performance'], a['name'], a['event_type'], a['department'], a['event_date'].isoformat()[:10])
+                     for a in achievements])
     
     def reports_menu(self):
         """Display reports menu"""
-        menu = {
-            '1': ('Top Participating Students', self.show_top_students),
-            '2': ('Department-wise Participation', self.show_department_participation),
-            '3': ('Events by Participation', self.show_events_by_participation),
-            '4': ('Performance Summary', self.show_performance_summary),
-            '5': ('Event Type Statistics', self.show_event_type_statistics),
-            '6': ('Monthly Event Summary', self.show_monthly_summary),
-            '7': ('Top Performers', self.show_top_performers),
-            '8': ('Generate Comprehensive Report', self.generate_comprehensive_report)
-        }
-        
-        while True:
-            choice = self.display_menu(menu, "REPORTS")
-            
-            if choice in menu:
-                _, function = menu[choice]
-                function()
-                input("\nPress Enter to continue...")
-            elif choice == 'b':
-                break
-            elif choice == 'q':
-                self.quit_application()
-            else:
-                input("Invalid choice. Press Enter to continue...")
+        self.run_submenu(self._reports_menu, "REPORTS")
     
     def show_top_students(self):
         """Show top participating students"""
@@ -713,18 +874,19 @@ class CollegeEventTracker:
             print("Using default value: 10")
             limit = 10
         
-        students = self.reports_module.get_top_participating_students(limit)
+        lines = self.reports_module.iter_top_participating_student_lines(_TOP_STUDENT_TABLE.widths, limit)
+        first = next(lines, None)
         
-        if not students:
+        if first is None:
             print("No participation data found.")
             return
         
-        print(f"\nTop {len(students)} Participating Students:")
-        print(f"{'Rank':<5} {'USN':<12} {'Name':<25} {'Department':<20} {'Year':<5} {'Participations':<15}")
-        print("-" * 85)
+        print(f"\nTop {limit} Participating Students:")
+        print(_TOP_STUDENT_TABLE.header)
+        print(_TOP_STUDENT_TABLE.separator)
         
-        for i, student in enumerate(students, 1):
-            print(f"{i:<5} {student['usn']:<12} {student['name']:<25} {student['department']:<20} {student['year']:<5} {student['participation_count']:<15}")
+        # Rows arrive ranked and padded by the database
+        write_batched(chain([first], lines))
     
     def show_department_participation(self):
         """Show department-wise participation"""
@@ -737,27 +899,14 @@ class CollegeEventTracker:
             print("No department participation data found.")
             return
         
-        print(f"{'Department':<20} {'Students':<10} {'Events':<10} {'Participations':<15} {'Avg/Student':<12}")
-        print("-" * 70)
+        print(_DEPARTMENT_TABLE.header)
+        print(_DEPARTMENT_TABLE.separator)
         
-        for dept in data:
-            print(f"{dept['department']:<20} {dept['total_students']:<10} {dept['unique_events_participated']:<10} {dept['total_participations']:<15} {dept['avg_per_student']:<12}")
+        fmt = _DEPARTMENT_TABLE.row
+        write_lines([fmt(d['department'], d['total_students'], d['unique_events_participated'],
+                         d['total_participations'], d['avg_per_student'])
+                     for d in data])
     
-    def show_events_by_participation(self):
-        """Show events by participation count"""
-        print("\nEVENTS BY PARTICIPATION")
-        print("======================")
-        
-        limit = input("Number of events to show (default: 10): ").strip()
-        
-        try:
-            limit = int(limit) if limit else 10
-        except ValueError:
-            print("Using default value: 10")
-            limit = 10
-        
-        events = self.reports_module
-
     def show_events_by_participation(self):
         """Show events by participation count"""
         print("\nEVENTS BY PARTICIPATION")
@@ -777,12 +926,13 @@ class CollegeEventTracker:
             print("No event participation data found.")
             return
         
-        print(f"\nTop {len(events)} Events by Participation:")
-        print(f"{'Rank':<5} {'ID':<5} {'Event Name':<30} {'Type':<15} {'Department':<20} {'Participants':<12}")
-        print("-" * 90)
+        out = [f"\nTop {len(events)} Events by Participation:", _EVENT_RANK_TABLE.header, _EVENT_RANK_TABLE.separator]
+        
+        out.extend([_EVENT_RANK_TABLE.row(i, e['event_id'], e['name'], e['event_type'],
+                                          e['department'], e['participant_count'])
+                    for i, e in enumerate(events, 1)])
         
-        for i, event in enumerate(events, 1):
-            print(f"{i:<5} {event['event_id']:<5} {event['name']:<30} {event['event_type']:<15} {event['department']:<20} {event['participant_count']:<12}")
+        write_lines(out)
     
     def show_performance_summary(self):
         """Show performance summary"""
@@ -795,14 +945,21 @@ class CollegeEventTracker:
             print("No performance data found.")
             return
         
-        print(f"{'Performance':<12} {'Count':<8} {'Percentage':<12}")
-        print("-" * 35)
+        out = [_PERFORMANCE_TABLE.header, _PERFORMANCE_TABLE.separator]
+        
+        # The summary is broken down by department; total each performance across them
+        counts = {
+            'Winner': sum(item['winners'] for item in summary),
+            'Runner-up': sum(item['runners_up'] for item in summary),
+            'Participant': sum(item['participants'] for item in summary)
+        }
+        total = sum(counts.values())
         
-        total = sum(item['count'] for item in summary)
+        for performance, count in counts.items():
+            percentage = (count / total * 100) if total > 0 else 0
+            out.append(_PERFORMANCE_TABLE.row(performance, count, f"{percentage:.2f}%"))
         
-        for item in summary:
-            percentage = (item['count'] / total * 100) if total > 0 else 0
-            print(f"{item['performance']:<12} {item['count']:<8} {percentage:.2f}%")
+        write_lines(out)
     
     def show_event_type_statistics(self):
         """Show statistics by event type"""
@@ -815,12 +972,13 @@ class CollegeEventTracker:
             print("No event type statistics found.")
             return
         
-        print(f"{'Event Type':<20} {'Total Events':<15} {'Total Participants':<20} {'Avg/Event':<12}")
-        print("-" * 70)
+        out = [_EVENT_TYPE_TABLE.header, _EVENT_TYPE_TABLE.separator]
         
         for stat in stats:
-            avg = stat['total_participants'] / stat['total_events'] if stat['total_events'] > 0 else 0
-            print(f"{stat['event_type']:<20} {stat['total_events']:<15} {stat['total_participants']:<20} {avg:.2f}")
+            avg = stat['total_participations'] / stat['total_events'] if stat['total_events'] > 0 else 0
+            out.append(_EVENT_TYPE_TABLE.row(stat['event_type'], stat['total_events'], stat['total_participations'], avg))
+        
+        write_lines(out)
     
     def show_monthly_summary(self):
         """Show monthly event summary"""
@@ -844,16 +1002,13 @@ class CollegeEventTracker:
             print(f"No event data found for year {year}.")
             return
         
-        print(f"\nMonthly Event Summary for {year}:")
-        print(f"{'Month':<10} {'Events':<8} {'Participants':<15} {'Winners':<10} {'Runners-up':<12}")
-        print("-" * 60)
+        out = [f"\nMonthly Event Summary for {year}:", _MONTHLY_TABLE.header, _MONTHLY_TABLE.separator]
         
-        months = ['January', 'February', 'March', 'April', 'May', 'June', 
-                  'July', 'August', 'September', 'October', 'November', 'December']
+        out.extend([_MONTHLY_TABLE.row(_MONTHS[item['month'] - 1], item['event_count'], item['participant_count'],
+                                       item['winner_count'], item['runner_up_count'])
+                    for item in summary])
         
-        for item in summary:
-            month_name = months[item['month']-1]
-            print(f"{month_name:<10} {item['event_count']:<8} {item['participant_count']:<15} {item['winner_count']:<10} {item['runner_up_count']:<12}")
+        write_lines(out)
     
     def show_top_performers(self):
         """Show top performers (winners and runners-up)"""
@@ -870,17 +1025,18 @@ class CollegeEventTracker:
         
         performers = self.reports_module.get_top_performers(limit)
         
-        if not performers:
+        if not performers.get('usn'):
             print("No performance data found.")
             return
         
-        print(f"\nTop {len(performers)} Performers:")
-        print(f"{'Rank':<5} {'USN':<12} {'Name':<25} {'Department':<20} {'Wins':<6} {'Runner-ups':<12} {'Total':<6}")
-        print("-" * 90)
+        out = [f"\nTop {len(performers['usn'])} Performers:", _TOP_PERFORMER_TABLE.header, _TOP_PERFORMER_TABLE.separator]
+        
+        # Walk the columns side by side
+        rows = zip(performers['usn'], performers['name'], performers['department'],
+                   performers['wins'], performers['runner_ups'], performers['podium_total'])
+        out.extend([_TOP_PERFORMER_TABLE.row(i, *row) for i, row in enumerate(rows, 1)])
         
-        for i, performer in enumerate(performers, 1):
-            total = performer['winner_count'] + performer['runner_up_count']
-            print(f"{i:<5} {performer['usn']:<12} {performer['name']:<25} {performer['department']:<20} {performer['winner_count']:<6} {performer['runner_up_count']:<12} {total:<6}")
+        write_lines(out)
     
     def generate_comprehensive_report(self):
         """Generate a comprehensive report"""
@@ -903,72 +1059,26 @@ class CollegeEventTracker:
         else:
             year = None
         
-        report = self.reports_module.generate_comprehensive_report(year, department, event_type)
+        report = self.reports_module.generate_comprehensive_report(year, department, event_type, limit=10)
         
         if not report:
             print("No data available for the specified filters.")
             return
         
-        # Display report header
-        print("\n" + "=" * 80)
-        print("                   COLLEGE EVENT PARTICIPATION REPORT")
-        print("=" * 80)
-        
-        # Display filter information
-        print("\nReport Filters:")
-        print(f"Year: {year if year else 'All Years'}")
-        print(f"Department: {department if department else 'All Departments'}")
-        print(f"Event Type: {event_type if event_type else 'All Event Types'}")
-        print("\n" + "-" * 80)
-        
-        # Summary statistics
-        print("\nSUMMARY STATISTICS:")
-        print(f"Total Students: {report['summary']['total_students']}")
-        print(f"Total Events: {report['summary']['total_events']}")
-        print(f"Total Participations: {report['summary']['total_participations']}")
-        print(f"Average Participations per Student: {report['summary']['avg_participations_per_student']:.2f}")
-        print(f"Average Participants per Event: {report['summary']['avg_participants_per_event']:.2f}")
-        
-        # Department statistics
-        print("\nDEPARTMENT STATISTICS:")
-        print(f"{'Department':<20} {'Students':<10} {'Participations':<15} {'Avg/Student':<12}")
-        print("-" * 60)
-        
-        for dept in report['departments']:
-            print(f"{dept['department']:<20} {dept['student_count']:<10} {dept['participation_count']:<15} {dept['avg_participations']:<12}")
-        
-        # Event type statistics
-        print("\nEVENT TYPE STATISTICS:")
-        print(f"{'Event Type':<20} {'Events':<8} {'Participations':<15} {'Avg/Event':<12}")
-        print("-" * 60)
-        
-        for event_type in report['event_types']:
-            print(f"{event_type['type']:<20} {event_type['event_count']:<8} {event_type['participation_count']:<15} {event_type['avg_participations']:<12}")
-        
-        # Top performing students
-        print("\nTOP PERFORMING STUDENTS:")
-        print(f"{'USN':<12} {'Name':<25} {'Department':<20} {'Wins':<6} {'Runner-ups':<12}")
-        print("-" * 80)
-        
-        for student in report['top_performers'][:10]:  # Show top 10
-            print(f"{student['usn']:<12} {student['name']:<25} {student['department']:<20} {student['winner_count']:<6} {student['runner_up_count']:<12}")
-        
-        # Most popular events
-        print("\nMOST POPULAR EVENTS:")
-        print(f"{'Event Name':<30} {'Type':<15} {'Department':<20} {'Participants':<12}")
-        print("-" * 80)
-        
-        for event in report['popular_events'][:10]:  # Show top 10
-            print(f"{event['name']:<30} {event['event_type']:<15} {event['department']:<20} {event['participant_count']:<12}")
-        
-        print("\n" + "=" * 80)
-        print("Report generated on:", datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
-        print("=" * 80)
+        # The report comes back fully laid out; add the filters and write it in one go
+        write_lines([
+            "\n" + "=" * 80,
+            "Report Filters:",
+            f"Year: {year if year else 'All Years'}",
+            f"Department: {department if department else 'All Departments'}",
+            f"Event Type: {event_type if event_type else 'All Event Types'}",
+            "=" * 80 + "\n",
+            report,
+        ])
     
     def quit_application(self):
         """Exit the application"""
-        print("\nThank you for using College Event Participation Tracker!")
-        print("Exiting...")
+        write_final("\nThank you for using College Event Participation Tracker!\nExiting...\n")
         sys.exit(0)
 
 
@@ -978,8 +1088,8 @@ if __name__ == "__main__":
         app = CollegeEventTracker()
         app.run()
     except KeyboardInterrupt:
-        print("\n\nProgram terminated by user.")
+        write_final("\n\nProgram terminated by user.\n")
         sys.exit(0)
     except Exception as e:
-        print(f"\nAn unexpected error occurred: {e}")
+        write_final(f"\nAn unexpected error occurred: {e}\n")
         sys.exit(1)
@@ -0,0 +1,159 @@
+"""
+migrations.py - Incremental schema changes for College Event Participation Tracker
+"""
+
+# Migrations applied in order when the application connects. Each one is a
+# (name, statements) pair; a migration is recorded in schema_migrations only
+# once every statement has succeeded, and is retried on the next connect
+# otherwise. Statements must be safe to run again: a statement failing because
+# its table, column, index or trigger already exists counts as done.
+MIGRATIONS = [
+    # Inverted index used by EventModule.search_events
+    ("events_fulltext", [
+        """
+        ALTER TABLE events
+        ADD FULLTEXT INDEX idx_events_ft (name, event_type, department)
+        """,
+    ]),
+
+    # Denormalized participant count read by EventModule.get_all_events
+    ("events_participant_count", [
+        """
+        ALTER TABLE events
+        ADD COLUMN participant_count INT NOT NULL DEFAULT 0
+        """,
+        """
+        CREATE TRIGGER participation_after_insert
+        AFTER INSERT ON participation FOR EACH ROW
+        UPDATE events SET participant_count = participant_count + 1
+        WHERE event_id = NEW.event_id
+        """,
+        """
+        CREATE TRIGGER participation_after_delete
+        AFTER DELETE ON participation FOR EACH ROW
+        UPDATE events SET participant_count = participant_count - 1
+        WHERE event_id = OLD.event_id
+        """,
+        # Cascaded deletes don't fire participation triggers, so account
+        # for a student's participations before the student is removed
+        """
+        CREATE TRIGGER students_before_delete
+        BEFORE DELETE ON students FOR EACH ROW
+        UPDATE events e
+        SET e.participant_count = e.participant_count - (
+            SELECT COUNT(*) FROM participation p
+            WHERE p.event_id = e.event_id AND p.usn = OLD.usn
+        )
+        WHERE e.event_id IN (SELECT event_id FROM participation WHERE usn = OLD.usn)
+        """,
+        """
+        UPDATE events e
+        SET e.participant_count = (
+            SELECT COUNT(*) FROM participation p WHERE p.event_id = e.event_id
+        )
+        """,
+    ]),
+
+    # Date-ordered event listings (upcoming, past, all events)
+    ("idx_events_date", [
+        "CREATE INDEX idx_events_date ON events (event_date)",
+    ]),
+
+    # Department filter with date ordering (get_department_events)
+    ("idx_events_dept_date", [
+        "CREATE INDEX idx_events_dept_date ON events (department, event_date)",
+    ]),
+
+    # Winner/runner-up counts per student (reports top performers and summaries)
+    ("idx_participation_perf_usn", [
+        "CREATE INDEX idx_participation_perf_usn ON participation (performance, usn)",
+    ]),
+
+    # Inverted index used by StudentModule.search_students
+    ("students_fulltext", [
+        """
+        ALTER TABLE students
+        ADD FULLTEXT INDEX idx_students_ft (usn, name, department)
+        """,
+    ]),
+
+    # One record per student and event; lets registration upsert in one statement
+    ("uk_participation", [
+        """
+        ALTER TABLE participation
+        ADD UNIQUE KEY uk_participation (usn, event_id)
+        """,
+    ]),
+
+    # Per-student participation counters read by the top-N reports
+    ("student_stats", [
+        """
+        CREATE TABLE student_stats (
+            usn VARCHAR(20) NOT NULL PRIMARY KEY,
+            participation_count INT NOT NULL DEFAULT 0,
+            winner_count INT NOT NULL DEFAULT 0,
+            runner_up_count INT NOT NULL DEFAULT 0,
+            points INT AS (winner_count * 3 + runner_up_count * 2
+                           + (participation_count - winner_count - runner_up_count)) STORED,
+            INDEX idx_student_stats_count (participation_count),
+            INDEX idx_student_stats_points (points)
+        )
+        """,
+        """
+        CREATE TRIGGER participation_stats_after_insert
+        AFTER INSERT ON participation FOR EACH ROW
+        INSERT INTO student_stats (usn, participation_count, winner_count, runner_up_count)
+        VALUES (NEW.usn, 1, NEW.performance = 'Winner', NEW.performance = 'Runner-up')
+        ON DUPLICATE KEY UPDATE
+            participation_count = participation_count + 1,
+            winner_count = winner_count + VALUES(winner_count),
+            runner_up_count = runner_up_count + VALUES(runner_up_count)
+        """,
+        """
+        CREATE TRIGGER participation_stats_after_update
+        AFTER UPDATE ON participation FOR EACH ROW
+        UPDATE student_stats
+        SET winner_count = winner_count
+                + (NEW.performance = 'Winner') - (OLD.performance = 'Winner'),
+            runner_up_count = runner_up_count
+                + (NEW.performance = 'Runner-up') - (OLD.performance = 'Runner-up')
+        WHERE usn = NEW.usn
+        """,
+        """
+        CREATE TRIGGER participation_stats_after_delete
+        AFTER DELETE ON participation FOR EACH ROW
+        UPDATE student_stats
+        SET participation_count = participation_count - 1,
+            winner_count = winner_count - (OLD.performance = 'Winner'),
+            runner_up_count = runner_up_count - (OLD.performance = 'Runner-up')
+        WHERE usn = OLD.usn
+        """,
+        # Deleting an event cascades to participation without firing its
+        # triggers, so take the event's records off the counters first
+        """
+        CREATE TRIGGER events_before_delete
+        BEFORE DELETE ON events FOR EACH ROW
+        UPDATE student_stats ss
+        JOIN participation p ON p.usn = ss.usn AND p.event_id = OLD.event_id
+        SET ss.participation_count = ss.participation_count - 1,
+            ss.winner_count = ss.winner_count - (p.performance = 'Winner'),
+            ss.runner_up_count = ss.runner_up_count - (p.performance = 'Runner-up')
+        """,
+        # Likewise for a deleted student, whose counters go with them
+        """
+        CREATE TRIGGER students_stats_before_delete
+        BEFORE DELETE ON students FOR EACH ROW
+        DELETE FROM student_stats WHERE usn = OLD.usn
+        """,
+        """
+        INSERT INTO student_stats (usn, participation_count, winner_count, runner_up_count)
+        SELECT usn, COUNT(*), SUM(performance = 'Winner'), SUM(performance = 'Runner-up')
+        FROM participation
+        GROUP BY usn
+        ON DUPLICATE KEY UPDATE
+            participation_count = VALUES(participation_count),
+            winner_count = VALUES(winner_count),
+            runner_up_count = VALUES(runner_up_count)
+        """,
+    ]),
+]
@@ -2,81 +2,256 @@
 participation_module.py - Participation management module for College Event Participation Tracker
 """
 
-from db_connection import db
+from db_connection import get_db
 from student_module import StudentModule
 from event_module import EventModule
+from reports import ReportsModule
+from ttl_cache import TTLCache
+
+
+# One row describing a student, an event and their participation record;
+# the outer joins keep the row even when any of the three is missing
+_Q_LOOKUP_CONTEXT = """
+SELECT s.usn AS s_usn, s.name AS s_name, s.department AS s_department, s.year AS s_year,
+       e.event_id AS e_event_id, e.name AS e_name, e.event_type AS e_event_type,
+       e.department AS e_department, e.event_date AS e_event_date,
+       p.id AS p_id, p.performance AS p_performance
+FROM (SELECT 1) AS probe
+LEFT JOIN students s ON s.usn = %s
+LEFT JOIN events e ON e.event_id = %s
+LEFT JOIN participation p ON p.usn = s.usn AND p.event_id = e.event_id
+"""
+
+_Q_STUDENTS_IN = "SELECT * FROM students WHERE usn IN (%s)"
+
+_Q_EVENTS_IN = "SELECT * FROM events WHERE event_id IN (%s)"
+
+_Q_UPSERT = """
+INSERT INTO participation (usn, event_id, performance) 
+VALUES (%s, %s, %s)
+ON DUPLICATE KEY UPDATE performance = VALUES(performance)
+"""
+
+# Present once the uk_participation migration has run; without the key the
+# upsert above would insert duplicates instead of updating
+_Q_HAS_UNIQUE_KEY = """
+SELECT COUNT(*) FROM information_schema.statistics
+WHERE table_schema = DATABASE() AND table_name = 'participation'
+  AND index_name = 'uk_participation'
+"""
+
+_VALID_PERFORMANCES = ("Winner", "Runner-up", "Participant")
+
+_MISSING_UNIQUE_KEY = ("Participation records contain duplicate student/event pairs; "
+                       "remove them so the uk_participation key can be added")
+
+
+def _placeholders(count):
+    """Return a comma-separated list of count query placeholders"""
+    return ", ".join(["%s"] * count)
 
 
 class ParticipationModule:
     """Class to handle participation-related operations"""
     
+    # Winner and participant lists keyed by (event_id, kind), shared by all instances
+    _event_cache = TTLCache(maxsize=128, ttl=30)
+    
+    # Set once the participation unique key has been seen
+    _has_unique_key = False
+    
     def __init__(self):
         self.student_module = StudentModule()
         self.event_module = EventModule()
     
-    def register_participation(self, usn, event_id, performance="Participant"):
-        """Register a student's participation in an event"""
-        # Validate inputs
-        if not usn or not event_id:
-            return False, "Student USN and Event ID are required"
+    def register_participation(self, usn, event_id, performance="Participant", context=None):
+        """Register a student's participation in an event
         
-        # Validate performance value
-        valid_performances = ["Winner", "Runner-up", "Participant"]
-        if performance not in valid_performances:
-            return False, f"Performance must be one of: {', '.join(valid_performances)}"
+        context is the lookup_context result for usn and event_id, if the
+        caller already has it.
+        """
+        if context is None:
+            return self.register_participations_bulk([(usn, event_id, performance)])
+        if performance not in _VALID_PERFORMANCES:
+            return False, f"Performance must be one of: {', '.join(_VALID_PERFORMANCES)}"
+        problem = self._check_unique_key()
+        if problem:
+            return False, problem
+        return self._register_one(get_db(), (usn, event_id), performance, context)
+
+    def register_participations_bulk(self, rows):
+        """Register or update several participations with a single upsert
+        
+        rows is a sequence of (usn, event_id, performance) tuples. Nothing is
+        written unless every student and event exists; students and events
+        already in the module caches are not looked up again. A single row is
+        checked with lookup_context, which also tells an update from an insert.
+        """
+        # Later rows for the same student and event win
+        pending = {}
+        for usn, event_id, performance in rows:
+            if not usn or not event_id:
+                return False, "Student USN and Event ID are required"
+            # Event IDs come back from the database as ints; accept e.g. "5" from CSV
+            try:
+                event_id = int(event_id)
+            except (TypeError, ValueError):
+                return False, f"Invalid Event ID: {event_id}"
+            if performance not in _VALID_PERFORMANCES:
+                return False, f"Performance must be one of: {', '.join(_VALID_PERFORMANCES)}"
+            pending[(usn, event_id)] = performance
+        
+        if not pending:
+            return False, "No participations to register"
+        
+        problem = self._check_unique_key()
+        if problem:
+            return False, problem
+        
+        db = get_db()
+        if len(pending) == 1:
+            return self._register_one(db, *next(iter(pending.items())))
+        
+        usns = list({usn for usn, _ in pending})
+        event_ids = list({event_id for _, event_id in pending})
         
-        # Check if student exists
-        student = self.student_module.get_student_by_usn(usn)
+        # Look up students and events once for the whole batch;
+        # USNs are compared case-insensitively, as MySQL does
+        students = {usn.upper(): student for usn, student in self._cached_lookup(
+            StudentModule._student_cache, usns, _Q_STUDENTS_IN, 'usn').items()}
+        events = self._cached_lookup(EventModule._event_cache, event_ids, _Q_EVENTS_IN, 'event_id')
+        
+        for usn, event_id in pending:
+            if usn.upper() not in students:
+                return False, f"Student with USN {usn} not found"
+            if event_id not in events:
+                return False, f"Event with ID {event_id} not found"
+        
+        # One upsert covers new and existing records alike
+        values = [(usn, event_id, performance) for (usn, event_id), performance in pending.items()]
+        success = db.execute_many(_Q_UPSERT, values)
+        
+        for event_id in event_ids:
+            self._invalidate_event(event_id)
+        
+        if not success:
+            return False, "Failed to register participations"
+        return True, f"{len(values)} participations registered or updated"
+
+    def _register_one(self, db, key, performance, context=None):
+        """Register or update a single participation
+        
+        The lookup tells whether a record already exists, so the message
+        doesn't depend on the upsert's affected row count.
+        """
+        usn, event_id = key
+        if context is None:
+            context = self.lookup_context(usn, event_id)
+        student, event = context['student'], context['event']
         if not student:
             return False, f"Student with USN {usn} not found"
-        
-        # Check if event exists
-        event = self.event_module.get_event_by_id(event_id)
         if not event:
             return False, f"Event with ID {event_id} not found"
         
-        # Check if participation already exists
-        existing = self.get_participation(usn, event_id)
-        if existing:
-            # Update existing participation
-            query = """
-            UPDATE participation 
-            SET performance = %s 
-            WHERE usn = %s AND event_id = %s
-            """
-            success = db.execute_query(query, (performance, usn, event_id))
-            
-            if success:
-                return True, f"Updated {student['name']}'s participation in {event['name']}"
-            else:
-                return False, "Failed to update participation"
+        success = db.execute_update(_Q_UPSERT, (usn, event_id, performance)) >= 0
+        self._invalidate_event(event_id)
         
-        # Insert new participation
-        query = """
-        INSERT INTO participation (usn, event_id, performance) 
-        VALUES (%s, %s, %s)
+        if not success:
+            return False, "Failed to register participation"
+        if context['participation']:
+            return True, f"Updated {student['name']}'s participation in {event['name']}"
+        return True, f"Registered {student['name']} for {event['name']}"
+
+    def _check_unique_key(self):
+        """Check that the participation table has its (usn, event_id) unique key
+        
+        The uk_participation migration fails while duplicate records exist.
+        Returns None when the key is present, else a message saying why
+        registration can't go ahead.
         """
-        success = db.execute_query(query, (usn, event_id, performance))
+        cls = type(self)
+        if cls._has_unique_key:
+            return None
         
-        if success:
-            return True, f"Registered {student['name']} for {event['name']}"
-        else:
-            return False, "Failed to register participation"
+        db = get_db()
+        errors = db.error_count()
+        found = db.fetch_scalar(_Q_HAS_UNIQUE_KEY)
+        if db.error_count() != errors:
+            return "Failed to register participation"
+        if not found:
+            return _MISSING_UNIQUE_KEY
+        cls._has_unique_key = True
+        return None
 
-    def get_participation(self, usn, event_id):
-        """Get a specific participation record"""
-        query = """
-        SELECT id, usn, event_id, performance 
-        FROM participation 
-        WHERE usn = %s AND event_id = %s
+    def _cached_lookup(self, cache, keys, query, key_column):
+        """Return {key: row} for the given keys, serving what it can from cache
+        
+        Only the misses are fetched, with one IN query, and then cached; the
+        owning module drops its entries when a record is updated or deleted.
         """
-        return db.fetch_one(query, (usn, event_id))
+        found = {}
+        missing = []
+        for key in keys:
+            row = cache.get(key)
+            if row is None:
+                missing.append(key)
+            else:
+                found[key] = row
+        
+        if missing:
+            for row in get_db().fetch_all(query % _placeholders(len(missing)), missing):
+                cache[row[key_column]] = row
+                found[row[key_column]] = row
+        return found
 
-    def delete_participation(self, usn, event_id):
-        """Remove a student's participation from an event"""
+    def lookup_context(self, usn, event_id):
+        """Get a student, an event and their participation record with one query
+        
+        Returns a dict with 'student', 'event' and 'participation' keys; any of
+        them is None when the corresponding record doesn't exist.
+        """
+        row = get_db().fetch_one(_Q_LOOKUP_CONTEXT, (usn, event_id)) or {}
+        
+        student = None
+        if row.get('s_usn') is not None:
+            student = {
+                'usn': row['s_usn'],
+                'name': row['s_name'],
+                'department': row['s_department'],
+                'year': row['s_year']
+            }
+        
+        event = None
+        if row.get('e_event_id') is not None:
+            event = {
+                'event_id': row['e_event_id'],
+                'name': row['e_name'],
+                'event_type': row['e_event_type'],
+                'department': row['e_department'],
+                'event_date': row['e_event_date']
+            }
+        
+        participation = None
+        if row.get('p_id') is not None:
+            participation = {
+                'id': row['p_id'],
+                'usn': row['s_usn'],
+                'event_id': row['e_event_id'],
+                'performance': row['p_performance']
+            }
+        
+        return {'student': student, 'event': event, 'participation': participation}
+
+    def delete_participation(self, usn, event_id, context=None):
+        """Remove a student's participation from an event
+        
+        context is the lookup_context result for usn and event_id, if the
+        caller already has it.
+        """
         # Check if participation exists
-        existing = self.get_participation(usn, event_id)
-        if not existing:
+        if context is None:
+            context = self.lookup_context(usn, event_id)
+        if not context['participation']:
             return False, f"No participation record found for this student and event"
         
         # Delete participation
@@ -84,17 +259,20 @@ class ParticipationModule:
         DELETE FROM participation 
         WHERE usn = %s AND event_id = %s
         """
-        success = db.execute_query(query, (usn, event_id))
+        success = get_db().execute_query(query, (usn, event_id))
+        self._invalidate_event(event_id)
         
         if success:
-            student = self.student_module.get_student_by_usn(usn)
-            event = self.event_module.get_event_by_id(event_id)
-            return True, f"Removed {student['name']} from {event['name']}"
+            return True, f"Removed {context['student']['name']} from {context['event']['name']}"
         else:
             return False, "Failed to remove participation"
 
-    def get_all_participations(self):
-        """Get all participation records with student and event details"""
+    def get_all_participations(self, limit=None, offset=0):
+        """Get all participation records with student and event details, optionally one page at a time
+        
+        Without a limit the rows are streamed from the server as an iterator;
+        a page is returned as a list.
+        """
         query = """
         SELECT p.id, p.usn, s.name as student_name, s.department,
                p.event_id, e.name as event_name, e.event_type, 
@@ -102,20 +280,26 @@ class ParticipationModule:
         FROM participation p
         JOIN students s ON p.usn = s.usn
         JOIN events e ON p.event_id = e.event_id
-        ORDER BY e.event_date DESC, s.name
+        ORDER BY e.event_date DESC, s.name, p.id
         """
-        return db.fetch_all(query)
+        if limit is None:
+            return get_db().fetch_iter(query)
+        return get_db().fetch_all(query + "LIMIT %s OFFSET %s", (limit, offset))
 
-    def update_performance(self, usn, event_id, performance):
-        """Update a student's performance in an event"""
+    def update_performance(self, usn, event_id, performance, context=None):
+        """Update a student's performance in an event
+        
+        context is the lookup_context result for usn and event_id, if the
+        caller already has it.
+        """
         # Validate performance value
-        valid_performances = ["Winner", "Runner-up", "Participant"]
-        if performance not in valid_performances:
-            return False, f"Performance must be one of: {', '.join(valid_performances)}"
+        if performance not in _VALID_PERFORMANCES:
+            return False, f"Performance must be one of: {', '.join(_VALID_PERFORMANCES)}"
         
         # Check if participation exists
-        existing = self.get_participation(usn, event_id)
-        if not existing:
+        if context is None:
+            context = self.lookup_context(usn, event_id)
+        if not context['participation']:
             return False, f"No participation record found for this student and event"
         
         # Update performance
@@ -124,17 +308,44 @@ class ParticipationModule:
         SET performance = %s 
         WHERE usn = %s AND event_id = %s
         """
-        success = db.execute_query(query, (performance, usn, event_id))
+        success = get_db().execute_query(query, (performance, usn, event_id))
+        self._invalidate_event(event_id)
         
         if success:
-            student = self.student_module.get_student_by_usn(usn)
-            event = self.event_module.get_event_by_id(event_id)
-            return True, f"Updated {student['name']}'s performance in {event['name']} to {performance}"
+            return True, f"Updated {context['student']['name']}'s performance in {context['event']['name']} to {performance}"
         else:
             return False, "Failed to update performance"
 
+    @classmethod
+    def clear_cache(cls):
+        """Forget all cached winner and participant lists"""
+        cls._event_cache.clear()
+
+    def _invalidate_event(self, event_id):
+        """Drop cached winner and participant lists for an event, and cached reports"""
+        self._event_cache.pop((event_id, 'winners'))
+        self._event_cache.pop((event_id, 'participants'))
+        ReportsModule.clear_cache()
+
+    def get_event_participants(self, event_id):
+        """Get all participants for an event, cached for a short while"""
+        key = (event_id, 'participants')
+        participants = self._event_cache.get(key)
+        if participants is None:
+            errors = get_db().error_count()
+            participants = list(self.event_module.get_event_participants(event_id))
+            # An empty list from a failed query is not worth keeping
+            if get_db().error_count() == errors:
+                self._event_cache[key] = participants
+        return participants
+
     def get_event_winners(self, event_id):
-        """Get winners and runners-up for an event"""
+        """Get winners and runners-up for an event, cached for a short while"""
+        key = (event_id, 'winners')
+        winners = self._event_cache.get(key)
+        if winners is not None:
+            return winners
+        
         query = """
         SELECT s.usn, s.name, s.department, s.year, p.performance
         FROM students s
@@ -147,7 +358,12 @@ class ParticipationModule:
                 ELSE 3
             END
         """
-        return db.fetch_all(query, (event_id,))
+        db = get_db()
+        errors = db.error_count()
+        winners = db.fetch_all(query, (event_id,))
+        if db.error_count() == errors:
+            self._event_cache[key] = winners
+        return winners
 
     def get_student_achievements(self, usn):
         """Get a student's achievements (wins and runner-ups)"""
@@ -159,7 +375,7 @@ class ParticipationModule:
         WHERE p.usn = %s AND p.performance IN ('Winner', 'Runner-up')
         ORDER BY e.event_date DESC
         """
-        return db.fetch_all(query, (usn,))
+        return get_db().fetch_all(query, (usn,))
 
 
 # For testing the module
@@ -177,7 +393,7 @@ if __name__ == "__main__":
     
     # Get all participations
     participations = participation_module.get_all_participations()
-    print(f"Total participations: {len(participations)}")
+    print(f"Total participations: {sum(1 for _ in participations)}")
     
     # Get student achievements
     achievements = participation_module.get_student_achievements("1MS21CS001")
@@ -2,126 +2,314 @@
 reports.py - Reports generation module for College Event Participation Tracker
 """
 
-from db_connection import db
-from tabulate import tabulate
+from db_connection import get_db
+from ttl_cache import TTLCache, cached
 import os
 from datetime import datetime
 
 
+_Q_TOP_PARTICIPATING_STUDENTS = """
+SELECT s.usn, s.name, s.department, s.year, 
+       COUNT(p.id) AS participation_count
+FROM students s
+JOIN participation p ON s.usn = p.usn
+{joins}{where}
+GROUP BY s.usn, s.name, s.department, s.year
+ORDER BY participation_count DESC
+LIMIT %s
+"""
+
+_Q_TOP_PERFORMERS = """
+SELECT s.usn, s.name, s.department, s.year,
+       COUNT(CASE WHEN p.performance = 'Winner' THEN 1 END) AS wins,
+       COUNT(CASE WHEN p.performance = 'Runner-up' THEN 1 END) AS runner_ups,
+       COUNT(CASE WHEN p.performance IN ('Winner', 'Runner-up') THEN 1 END) AS podium_total,
+       COUNT(p.id) AS total_participations,
+       (COUNT(CASE WHEN p.performance = 'Winner' THEN 1 END) * 3 + 
+        COUNT(CASE WHEN p.performance = 'Runner-up' THEN 1 END) * 2 + 
+        COUNT(CASE WHEN p.performance = 'Participant' THEN 1 END)) AS points
+FROM students s
+JOIN participation p ON s.usn = p.usn
+{joins}{where}
+GROUP BY s.usn, s.name, s.department, s.year
+ORDER BY points DESC
+LIMIT %s
+"""
+
+# Unfiltered variants of the two rankings above, served from the
+# trigger-maintained student_stats counters instead of aggregating participation
+_Q_TOP_PARTICIPATING_STUDENTS_STATS = """
+SELECT s.usn, s.name, s.department, s.year, 
+       ss.participation_count
+FROM student_stats ss
+JOIN students s ON s.usn = ss.usn
+WHERE ss.participation_count > 0
+ORDER BY ss.participation_count DESC
+LIMIT %s
+"""
+
+_Q_TOP_PERFORMERS_STATS = """
+SELECT s.usn, s.name, s.department, s.year,
+       ss.winner_count AS wins,
+       ss.runner_up_count AS runner_ups,
+       ss.winner_count + ss.runner_up_count AS podium_total,
+       ss.participation_count AS total_participations,
+       ss.points
+FROM student_stats ss
+JOIN students s ON s.usn = ss.usn
+WHERE ss.participation_count > 0
+ORDER BY ss.points DESC
+LIMIT %s
+"""
+
+_Q_DEPARTMENT_WISE = """
+SELECT s.department, 
+       COUNT(DISTINCT s.usn) AS total_students,
+       COUNT(DISTINCT p.event_id) AS unique_events_participated,
+       COUNT(p.id) AS total_participations,
+       ROUND(COUNT(p.id) / COUNT(DISTINCT s.usn), 2) AS avg_per_student
+FROM students s
+LEFT JOIN participation p ON s.usn = p.usn
+{joins}{where}
+GROUP BY s.department
+ORDER BY total_participations DESC
+"""
+
+_Q_EVENTS_BY_PARTICIPATION = """
+SELECT e.event_id, e.name, e.event_type, e.department, 
+       e.event_date, COUNT(p.id) AS participant_count
+FROM events e
+LEFT JOIN participation p ON e.event_id = p.event_id
+{where}
+GROUP BY e.event_id, e.name, e.event_type, e.department, e.event_date
+ORDER BY participant_count DESC
+LIMIT %s
+"""
+
+_Q_PERFORMANCE_SUMMARY = """
+SELECT s.department,
+       COUNT(CASE WHEN p.performance = 'Winner' THEN 1 END) AS winners,
+       COUNT(CASE WHEN p.performance = 'Runner-up' THEN 1 END) AS runners_up,
+       COUNT(CASE WHEN p.performance = 'Participant' THEN 1 END) AS participants
+FROM students s
+JOIN participation p ON s.usn = p.usn
+{joins}{where}
+GROUP BY s.department
+ORDER BY winners DESC, runners_up DESC
+"""
+
+_Q_EVENT_TYPE_STATISTICS = """
+SELECT e.event_type,
+       COUNT(DISTINCT e.event_id) AS total_events,
+       COUNT(DISTINCT p.usn) AS total_unique_students,
+       COUNT(p.id) AS total_participations
+FROM events e
+LEFT JOIN participation p ON e.event_id = p.event_id
+{where}
+GROUP BY e.event_type
+ORDER BY total_participations DESC
+"""
+
+_Q_MONTHLY_SUMMARY = """
+SELECT 
+    LEFT(e.event_date, 7) AS month,
+    COUNT(DISTINCT e.event_id) AS total_events,
+    COUNT(DISTINCT p.usn) AS total_participants,
+    COUNT(p.id) AS total_participations
+FROM events e
+LEFT JOIN participation p ON e.event_id = p.event_id
+{where}
+GROUP BY LEFT(e.event_date, 7)
+ORDER BY month
+"""
+
+# Month-by-month breakdown of one year, as shown by the monthly summary screen
+_Q_MONTHLY_BREAKDOWN = """
+SELECT 
+    MONTH(e.event_date) AS month,
+    COUNT(DISTINCT e.event_id) AS event_count,
+    COUNT(p.id) AS participant_count,
+    COUNT(CASE WHEN p.performance = 'Winner' THEN 1 END) AS winner_count,
+    COUNT(CASE WHEN p.performance = 'Runner-up' THEN 1 END) AS runner_up_count
+FROM events e
+LEFT JOIN participation p ON e.event_id = p.event_id
+{where}
+GROUP BY MONTH(e.event_date)
+ORDER BY month
+"""
+
+# Same ranking with each row already laid out as a fixed-width table line;
+# the six column widths are filled in by iter_top_participating_student_lines
+_Q_TOP_PARTICIPATING_STUDENT_LINES = """
+SELECT CONCAT_WS(' ',
+           RPAD(ROW_NUMBER() OVER (ORDER BY ss.participation_count DESC, s.usn), {0:d}, ' '),
+           RPAD(s.usn, {1:d}, ' '),
+           RPAD(s.name, {2:d}, ' '),
+           RPAD(s.department, {3:d}, ' '),
+           RPAD(s.year, {4:d}, ' '),
+           RPAD(ss.participation_count, {5:d}, ' ')) AS line
+FROM student_stats ss
+JOIN students s ON s.usn = ss.usn
+WHERE ss.participation_count > 0
+ORDER BY ss.participation_count DESC, s.usn
+LIMIT %s
+"""
+
+
+def _filter_conditions(year, department, event_type, department_column):
+    """Build WHERE conditions and their parameters for the report filters"""
+    conditions, params = [], []
+    if year:
+        # A date range keeps the events date index usable, unlike YEAR(event_date)
+        conditions.append("e.event_date >= %s AND e.event_date < %s")
+        params += [f"{year}-01-01", f"{int(year) + 1}-01-01"]
+    if department:
+        conditions.append(f"{department_column} = %s")
+        params.append(department)
+    if event_type:
+        conditions.append("e.event_type = %s")
+        params.append(event_type)
+    return conditions, params
+
+
+def _participation_filters(year=None, department=None, event_type=None):
+    """Build the extra JOIN and WHERE text restricting student-based reports by
+    event year, student department and event type
+    
+    Returns (joins, where, params); the strings are empty when no filter is given.
+    """
+    conditions, params = _filter_conditions(year, department, event_type, "s.department")
+    if not conditions:
+        return "", "", params
+    
+    joins = "JOIN events e ON p.event_id = e.event_id\n" if (year or event_type) else ""
+    return joins, "WHERE " + " AND ".join(conditions), params
+
+
+def _top_query(template, stats_template, joins, where):
+    """Pick the student_stats query when unfiltered, else fill in the filtered template"""
+    if not where:
+        return stats_template
+    return template.format(joins=joins, where=where)
+
+
+def _event_filters(year=None, department=None, event_type=None):
+    """Build the WHERE text restricting event-based reports by event year,
+    event department and event type
+    
+    Returns (where, params); where is empty when no filter is given.
+    """
+    conditions, params = _filter_conditions(year, department, event_type, "e.department")
+    if not conditions:
+        return "", params
+    return "WHERE " + " AND ".join(conditions), params
+
+
+# Report query results keyed by (method, arguments); ParticipationModule
+# clears it whenever participation records change
+_report_cache = TTLCache(maxsize=64, ttl=30)
+
+
 class ReportsModule:
     """Class to handle reports generation"""
     
-    def get_top_participating_students(self, limit=10):
-        """Get students with the most event participations"""
-        query = """
-        SELECT s.usn, s.name, s.department, s.year, 
-               COUNT(p.id) AS participation_count
-        FROM students s
-        JOIN participation p ON s.usn = p.usn
-        GROUP BY s.usn, s.name, s.department, s.year
-        ORDER BY participation_count DESC
-        LIMIT %s
-        """
-        return db.fetch_all(query, (limit,))
+    @cached(_report_cache, lambda: get_db().error_count())
+    def get_top_participating_students(self, limit=10, year=None, department=None, event_type=None):
+        """Get students with the most event participations, optionally filtered"""
+        joins, where, params = _participation_filters(year, department, event_type)
+        query = _top_query(_Q_TOP_PARTICIPATING_STUDENTS, _Q_TOP_PARTICIPATING_STUDENTS_STATS, joins, where)
+        return get_db().fetch_all(query, (*params, limit))
     
-    def get_department_wise_participation(self):
-        """Get participation statistics by department"""
-        query = """
-        SELECT s.department, 
-               COUNT(DISTINCT s.usn) AS total_students,
-               COUNT(DISTINCT p.event_id) AS unique_events_participated,
-               COUNT(p.id) AS total_participations,
-               ROUND(COUNT(p.id) / COUNT(DISTINCT s.usn), 2) AS avg_per_student
-        FROM students s
-        LEFT JOIN participation p ON s.usn = p.usn
-        GROUP BY s.department
-        ORDER BY total_participations DESC
-        """
-        return db.fetch_all(query)
-
-    def get_events_by_participation(self, limit=10):
-        """Get events with the most participants"""
-        query = """
-        SELECT e.event_id, e.name, e.event_type, e.department, 
-               e.event_date, COUNT(p.id) AS participant_count
-        FROM events e
-        LEFT JOIN participation p ON e.event_id = p.event_id
-        GROUP BY e.event_id, e.name, e.event_type, e.department, e.event_date
-        ORDER BY participant_count DESC
-        LIMIT %s
-        """
-        return db.fetch_all(query, (limit,))
-
-    def get_performance_summary(self):
-        """Get summary of student performances"""
-        query = """
-        SELECT s.department,
-               COUNT(CASE WHEN p.performance = 'Winner' THEN 1 END) AS winners,
-               COUNT(CASE WHEN p.performance = 'Runner-up' THEN 1 END) AS runners_up,
-               COUNT(CASE WHEN p.performance = 'Participant' THEN 1 END) AS participants
-        FROM students s
-        JOIN participation p ON s.usn = p.usn
-        GROUP BY s.department
-        ORDER BY winners DESC, runners_up DESC
-        """
-        return db.fetch_all(query)
-
-    def get_event_type_statistics(self):
-        """Get statistics by event type"""
-        query = """
-        SELECT e.event_type,
-               COUNT(DISTINCT e.event_id) AS total_events,
-               COUNT(DISTINCT p.usn) AS total_unique_students,
-               COUNT(p.id) AS total_participations
-        FROM events e
-        LEFT JOIN participation p ON e.event_id = p.event_id
-        GROUP BY e.event_type
-        ORDER BY total_participations DESC
+    def iter_top_participating_students(self, limit=10):
+        """Iterate over students with the most event participations, streaming from the server"""
+        return get_db().fetch_iter(_Q_TOP_PARTICIPATING_STUDENTS_STATS, (limit,))
+    
+    def iter_top_participating_student_lines(self, widths, limit=10):
+        """Iterate over ranked, preformatted table lines for the top participating students
+        
+        widths gives the rank, USN, name, department, year and count column widths.
         """
-        return db.fetch_all(query)
-
-    def get_monthly_event_summary(self):
-        """Get monthly event and participation summary"""
-        query = """
-        SELECT 
-            DATE_FORMAT(e.event_date, '%Y-%m') AS month,
-            COUNT(DISTINCT e.event_id) AS total_events,
-            COUNT(DISTINCT p.usn) AS total_participants,
-            COUNT(p.id) AS total_participations
-        FROM events e
-        LEFT JOIN participation p ON e.event_id = p.event_id
-        GROUP BY DATE_FORMAT(e.event_date, '%Y-%m')
-        ORDER BY month
+        query = _Q_TOP_PARTICIPATING_STUDENT_LINES.format(*widths)
+        return (row['line'] for row in get_db().fetch_iter(query, (limit,)))
+    
+    @cached(_report_cache, lambda: get_db().error_count())
+    def get_department_wise_participation(self, year=None, department=None, event_type=None):
+        """Get participation statistics by department, optionally filtered"""
+        joins, where, params = _participation_filters(year, department, event_type)
+        return get_db().fetch_all(_Q_DEPARTMENT_WISE.format(joins=joins, where=where), params)
+
+    @cached(_report_cache, lambda: get_db().error_count())
+    def get_events_by_participation(self, limit=10, year=None, department=None, event_type=None):
+        """Get events with the most participants, optionally filtered"""
+        where, params = _event_filters(year, department, event_type)
+        return get_db().fetch_all(_Q_EVENTS_BY_PARTICIPATION.format(where=where), (*params, limit))
+
+    @cached(_report_cache, lambda: get_db().error_count())
+    def get_performance_summary(self, year=None, department=None, event_type=None):
+        """Get summary of student performances, optionally filtered"""
+        joins, where, params = _participation_filters(year, department, event_type)
+        return get_db().fetch_all(_Q_PERFORMANCE_SUMMARY.format(joins=joins, where=where), params)
+
+    @cached(_report_cache, lambda: get_db().error_count())
+    def get_event_type_statistics(self, year=None, department=None, event_type=None):
+        """Get statistics by event type, optionally filtered"""
+        where, params = _event_filters(year, department, event_type)
+        return get_db().fetch_all(_Q_EVENT_TYPE_STATISTICS.format(where=where), params)
+
+    @cached(_report_cache, lambda: get_db().error_count())
+    def get_monthly_event_summary(self, year=None, department=None, event_type=None):
+        """Get monthly event and participation summary, optionally filtered"""
+        where, params = _event_filters(year, department, event_type)
+        return get_db().fetch_all(_Q_MONTHLY_SUMMARY.format(where=where), params)
+
+    @cached(_report_cache, lambda: get_db().error_count())
+    def get_monthly_summary(self, year):
+        """Get event, participant, winner and runner-up counts for each month of year
+        
+        month is the month number (1-12); months without events are left out.
         """
-        return db.fetch_all(query)
-
-    def get_top_performers(self, limit=10):
-        """Get top performing students based on a point system"""
-        query = """
-        SELECT s.usn, s.name, s.department, s.year,
-               COUNT(CASE WHEN p.performance = 'Winner' THEN 1 END) AS wins,
-               COUNT(CASE WHEN p.performance = 'Runner-up' THEN 1 END) AS runner_ups,
-               COUNT(p.id) AS total_participations,
-               (COUNT(CASE WHEN p.performance = 'Winner' THEN 1 END) * 3 + 
-                COUNT(CASE WHEN p.performance = 'Runner-up' THEN 1 END) * 2 + 
-                COUNT(CASE WHEN p.performance = 'Participant' THEN 1 END)) AS points
-        FROM students s
-        JOIN participation p ON s.usn = p.usn
-        GROUP BY s.usn, s.name, s.department, s.year
-        ORDER BY points DESC
-        LIMIT %s
+        where, params = _event_filters(year)
+        return get_db().fetch_all(_Q_MONTHLY_BREAKDOWN.format(where=where), params)
+
+    @cached(_report_cache, lambda: get_db().error_count())
+    def get_top_performers(self, limit=10, year=None, department=None, event_type=None):
+        """Get top performing students based on a point system, optionally filtered
+        
+        Returns {column: [values]} for usn, name, department, year, wins,
+        runner_ups, podium_total, total_participations and points.
         """
-        return db.fetch_all(query, (limit,))
+        joins, where, params = _participation_filters(year, department, event_type)
+        query = _top_query(_Q_TOP_PERFORMERS, _Q_TOP_PERFORMERS_STATS, joins, where)
+        return get_db().fetch_columns(query, (*params, limit))
+
+    @staticmethod
+    def clear_cache():
+        """Forget all cached report results"""
+        _report_cache.clear()
 
     def format_report_table(self, data, title):
-        """Format data as a table with title"""
-        if not data:
+        """Format data as a table with title
+        
+        data is a {column: [values]} dict as returned by fetch_columns, or a
+        list of row dicts.
+        """
+        if isinstance(data, list):
+            data = {column: [row[column] for row in data] for column in data[0]} if data else {}
+        
+        if not data or not next(iter(data.values())):
             return f"\n{title}\n\nNo data available for this report."
         
-        headers = data[0].keys()
-        table_data = [list(row.values()) for row in data]
+        # Stringify each column once, then size it to its widest cell
+        headers = list(data)
+        columns = [[str(value) for value in values] for values in data.values()]
+        widths = [max(len(header), *map(len, column)) for header, column in zip(headers, columns)]
+        
+        lines = [" | ".join(header.ljust(width) for header, width in zip(headers, widths)),
+                 "-+-".join("-" * width for width in widths)]
+        lines.extend(" | ".join(cell.ljust(width) for cell, width in zip(row, widths))
+                     for row in zip(*columns))
         
-        table = tabulate(table_data, headers=headers, tablefmt="grid")
+        table = "\n".join(lines)
         return f"\n{title}\n\n{table}"
 
     def save_report_to_file(self, report_content, filename=None):
@@ -147,8 +335,34 @@ class ReportsModule:
         
         return file_path
 
-    def generate_comprehensive_report(self):
-        """Generate a comprehensive report combining all report types"""
+    def generate_comprehensive_report(self, year=None, department=None, event_type=None, limit=10):
+        """Generate a comprehensive report combining all report types
+        
+        The filters restrict every section to events in year, the given
+        department (the student's or the event's, per section) and event_type.
+        The ranked sections fetch only their top limit rows. Returns the
+        report as ready-to-print text, or None when no events match.
+        """
+        joins, where, params = _participation_filters(year, department, event_type)
+        event_where, event_params = _event_filters(year, department, event_type)
+        
+        # Fetch every section in a single round trip
+        (top_students, dept_participation, top_events, performance,
+         event_stats, monthly, top_performers) = get_db().fetch_all_multi([
+            _top_query(_Q_TOP_PARTICIPATING_STUDENTS, _Q_TOP_PARTICIPATING_STUDENTS_STATS, joins, where),
+            _Q_DEPARTMENT_WISE.format(joins=joins, where=where),
+            _Q_EVENTS_BY_PARTICIPATION.format(where=event_where),
+            _Q_PERFORMANCE_SUMMARY.format(joins=joins, where=where),
+            _Q_EVENT_TYPE_STATISTICS.format(where=event_where),
+            _Q_MONTHLY_SUMMARY.format(where=event_where),
+            _top_query(_Q_TOP_PERFORMERS, _Q_TOP_PERFORMERS_STATS, joins, where),
+        ], (*params, limit, *params, *event_params, limit, *params,
+            *event_params, *event_params, *params, limit))
+        
+        # Nothing matched the filters (or the batch failed)
+        if not any(next(iter(section.values()), None) for section in (top_students, top_events)):
+            return None
+        
         # Add report header
         timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         report = f"COLLEGE EVENT PARTICIPATION TRACKER - COMPREHENSIVE REPORT\n"
@@ -156,38 +370,31 @@ class ReportsModule:
         report += "="*80 + "\n\n"
         
         # Add top participating students
-        top_students = self.get_top_participating_students(limit=10)
-        report += self.format_report_table(top_students, "TOP 10 PARTICIPATING STUDENTS")
+        report += self.format_report_table(top_students, f"TOP {limit} PARTICIPATING STUDENTS")
         report += "\n\n" + "="*80 + "\n\n"
         
         # Add department-wise participation
-        dept_participation = self.get_department_wise_participation()
         report += self.format_report_table(dept_participation, "DEPARTMENT-WISE PARTICIPATION")
         report += "\n\n" + "="*80 + "\n\n"
         
         # Add events by participation
-        top_events = self.get_events_by_participation(limit=10)
-        report += self.format_report_table(top_events, "TOP 10 EVENTS BY PARTICIPATION")
+        report += self.format_report_table(top_events, f"TOP {limit} EVENTS BY PARTICIPATION")
         report += "\n\n" + "="*80 + "\n\n"
         
         # Add performance summary
-        performance = self.get_performance_summary()
         report += self.format_report_table(performance, "PERFORMANCE SUMMARY BY DEPARTMENT")
         report += "\n\n" + "="*80 + "\n\n"
         
         # Add event type statistics
-        event_stats = self.get_event_type_statistics()
         report += self.format_report_table(event_stats, "EVENT TYPE STATISTICS")
         report += "\n\n" + "="*80 + "\n\n"
         
         # Add monthly summary
-        monthly = self.get_monthly_event_summary()
         report += self.format_report_table(monthly, "MONTHLY EVENT SUMMARY")
         report += "\n\n" + "="*80 + "\n\n"
         
         # Add top performers
-        top_performers = self.get_top_performers(limit=10)
-        report += self.format_report_table(top_performers, "TOP 10 PERFORMERS (BY POINTS)")
+        report += self.format_report_table(top_performers, f"TOP {limit} PERFORMERS (BY POINTS)")
         
         return report
 
@@ -202,5 +409,6 @@ if __name__ == "__main__":
     
     # Generate comprehensive report
     report = reports_module.generate_comprehensive_report()
-    file_path = reports_module.save_report_to_file(report, "comprehensive_report.txt")
-    print(f"Comprehensive report saved to: {file_path}")
+    if report:
+        file_path = reports_module.save_report_to_file(report, "comprehensive_report.txt")
+        print(f"Comprehensive report saved to: {file_path}")
@@ -2,18 +2,47 @@
 student_module.py - Student management module for College Event Participation Tracker
 """
 
-from db_connection import db
+from db_connection import get_db
+from reports import ReportsModule
+from ttl_cache import TTLCache
 import re
 
 
+# USN layout, e.g. 1MS21CS001
+_USN_RE = re.compile(r'^\d[A-Z]{2}\d{2}[A-Z]{2}\d{3}$')
+
+_Q_BY_USN = "SELECT * FROM students WHERE usn = %s"
+
+_Q_SEARCH = """
+SELECT * FROM students 
+WHERE MATCH(usn, name, department) AGAINST (%s IN BOOLEAN MODE)
+ORDER BY department, year, name
+"""
+
+_Q_SEARCH_LIKE = """
+SELECT * FROM students 
+WHERE usn LIKE %s OR name LIKE %s OR department LIKE %s
+ORDER BY department, year, name
+"""
+
+
+def _clear_participation_cache():
+    """Drop ParticipationModule's cached winner and participant lists"""
+    # Imported here: participation_module imports this module
+    from participation_module import ParticipationModule
+    ParticipationModule.clear_cache()
+
+
 class StudentModule:
     """Class to handle student-related operations"""
 
+    # Recently fetched students keyed by USN, shared by all instances
+    _student_cache = TTLCache(maxsize=1024, ttl=60)
+
     @staticmethod
     def validate_usn(usn):
         """Validate USN format (e.g., 1MS21CS001)"""
-        pattern = r'^\d[A-Z]{2}\d{2}[A-Z]{2}\d{3}$'
-        return bool(re.match(pattern, usn))
+        return _USN_RE.match(usn) is not None
 
     @staticmethod
     def validate_year(year):
@@ -39,7 +68,7 @@ class StudentModule:
             return False, "Year must be between 1 and 5"
         
         # Check if USN already exists
-        existing = db.fetch_one("SELECT usn FROM students WHERE usn = %s", (usn,))
+        existing = get_db().fetch_scalar("SELECT 1 FROM students WHERE usn = %s", (usn,))
         if existing:
             return False, f"Student with USN {usn} already exists"
         
@@ -48,29 +77,44 @@ class StudentModule:
         INSERT INTO students (usn, name, department, year) 
         VALUES (%s, %s, %s, %s)
         """
-        success = db.execute_query(query, (usn, name, department, int(year)))
+        success = get_db().execute_query(query, (usn, name, department, int(year)))
         
         if success:
             return True, f"Student {name} ({usn}) added successfully"
         else:
             return False, "Failed to add student"
 
-    def get_all_students(self):
-        """Get all students with their participation count"""
+    def get_all_students(self, limit=None, offset=0):
+        """Get all students with their participation count, optionally one page at a time
+        
+        Without a limit the rows are streamed from the server as an iterator;
+        a page is returned as a list.
+        """
         query = """
         SELECT s.usn, s.name, s.department, s.year, 
                COUNT(p.id) AS participation_count
         FROM students s
         LEFT JOIN participation p ON s.usn = p.usn
         GROUP BY s.usn, s.name, s.department, s.year
-        ORDER BY s.department, s.year, s.name
+        ORDER BY s.department, s.year, s.name, s.usn
         """
-        return db.fetch_all(query)
+        if limit is None:
+            return get_db().fetch_iter(query)
+        return get_db().fetch_all(query + "LIMIT %s OFFSET %s", (limit, offset))
 
     def get_student_by_usn(self, usn):
         """Get student details by USN"""
-        query = "SELECT * FROM students WHERE usn = %s"
-        return db.fetch_one(query, (usn,))
+        student = self._student_cache.get(usn)
+        if student is not None:
+            return student
+        
+        rows = get_db().fetch_prepared(_Q_BY_USN, (usn,))
+        if not rows:
+            return None
+        
+        student = rows[0]
+        self._student_cache[usn] = student
+        return student
 
     def update_student(self, usn, name, department, year):
         """Update student information"""
@@ -83,8 +127,7 @@ class StudentModule:
             return False, "Year must be between 1 and 5"
         
         # Check if student exists
-        existing = self.get_student_by_usn(usn)
-        if not existing:
+        if not get_db().fetch_scalar("SELECT 1 FROM students WHERE usn = %s", (usn,)):
             return False, f"Student with USN {usn} not found"
         
         # Update student
@@ -93,7 +136,10 @@ class StudentModule:
         SET name = %s, department = %s, year = %s 
         WHERE usn = %s
         """
-        success = db.execute_query(query, (name, department, int(year), usn))
+        success = get_db().execute_query(query, (name, department, int(year), usn))
+        self._student_cache.pop(usn)
+        ReportsModule.clear_cache()
+        _clear_participation_cache()
         
         if success:
             return True, f"Student {name} ({usn}) updated successfully"
@@ -103,13 +149,15 @@ class StudentModule:
     def delete_student(self, usn):
         """Delete a student record"""
         # Check if student exists
-        existing = self.get_student_by_usn(usn)
-        if not existing:
+        if not get_db().fetch_scalar("SELECT 1 FROM students WHERE usn = %s", (usn,)):
             return False, f"Student with USN {usn} not found"
         
         # Delete student (participation records will be deleted due to CASCADE)
         query = "DELETE FROM students WHERE usn = %s"
-        success = db.execute_query(query, (usn,))
+        success = get_db().execute_query(query, (usn,))
+        self._student_cache.pop(usn)
+        ReportsModule.clear_cache()
+        _clear_participation_cache()
         
         if success:
             return True, f"Student with USN {usn} deleted successfully"
@@ -118,13 +166,7 @@ class StudentModule:
 
     def search_students(self, search_term):
         """Search students by name, USN, or department"""
-        query = """
-        SELECT * FROM students 
-        WHERE usn LIKE %s OR name LIKE %s OR department LIKE %s
-        ORDER BY department, year, name
-        """
-        search_param = f"%{search_term}%"
-        return db.fetch_all(query, (search_param, search_param, search_param))
+        return get_db().fetch_search(_Q_SEARCH, _Q_SEARCH_LIKE, search_term)
 
     def get_student_events(self, usn):
         """Get all events a student has participated in"""
@@ -136,7 +178,7 @@ class StudentModule:
         WHERE p.usn = %s
         ORDER BY e.event_date DESC
         """
-        return db.fetch_all(query, (usn,))
+        return get_db().fetch_all(query, (usn,))
 
 
 # For testing the module
@@ -150,7 +192,7 @@ if __name__ == "__main__":
     
     # Get all students
     students = student_module.get_all_students()
-    print(f"Total students: {len(students)}")
+    print(f"Total students: {sum(1 for _ in students)}")
     
     # Get student by USN
     student = student_module.get_student_by_usn("1MS21CS100")
@@ -0,0 +1,79 @@
+"""
+ttl_cache.py - Small time-bounded cache for College Event Participation Tracker
+"""
+
+from collections import OrderedDict
+from functools import wraps
+import threading
+import time
+
+
+class TTLCache:
+    """Dictionary-like cache whose entries expire after ttl seconds
+
+    Safe to share between threads; every operation holds the cache's lock.
+    """
+
+    def __init__(self, maxsize=1024, ttl=30):
+        """Initialize an empty cache holding at most maxsize entries"""
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        """Return the cached value for key, or default if missing or expired"""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return default
+
+            value, expires_at = entry
+            if time.monotonic() >= expires_at:
+                del self._data[key]
+                return default
+            return value
+
+    def __setitem__(self, key, value):
+        """Store value for key, evicting the oldest entry when full"""
+        with self._lock:
+            self._data.pop(key, None)
+            if len(self._data) >= self.maxsize:
+                self._data.popitem(last=False)
+            self._data[key] = (value, time.monotonic() + self.ttl)
+
+    def pop(self, key, default=None):
+        """Remove key and return its value (expired or not), or default"""
+        with self._lock:
+            entry = self._data.pop(key, None)
+        return default if entry is None else entry[0]
+
+    def clear(self):
+        """Remove all entries"""
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+
+def cached(cache, error_count=None):
+    """Decorate a method so its results are kept in cache, keyed by method name and arguments
+
+    The instance itself is not part of the key, so all instances share entries.
+    error_count, if given, returns a running count of failures; a result
+    produced while it went up is returned but not cached.
+    """
+    def decorator(method):
+        @wraps(method)
+        def wrapper(self, *args, **kwargs):
+            key = (method.__name__, args, tuple(sorted(kwargs.items())))
+            value = cache.get(key)
+            if value is None:
+                errors = error_count() if error_count else 0
+                value = method(self, *args, **kwargs)
+                if not error_count or error_count() == errors:
+                    cache[key] = value
+            return value
+        return wrapper
+    return decorator